@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -9,8 +10,11 @@ import os
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.principal_cache import principal_cache
 from app.crud.user_crud import get_user_by_id
 from app.db.database import get_db
+from app.metrics.instruments import AUTH_CURRENT_USER_DURATION
+from app.models.models import User
 
 load_dotenv()
 
@@ -45,10 +49,8 @@ def decode_access_token(token: str) -> dict:
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
-):
-    """Retrieve current authenticated user from token."""
+def _user_id_from_token(token: str) -> int:
+    """Extract the user ID from a bearer token or raise 401."""
     try:
         payload = decode_access_token(token)
         user_id = payload.get("sub")
@@ -58,16 +60,7 @@ async def get_current_user(
                 detail="Invalid token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-
-        user = await get_user_by_id(db, int(user_id))
-        if user is None:
-            raise HTTPException(
-                status_code=401,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        return user
+        return int(user_id)
 
     except ExpiredSignatureError:
         raise HTTPException(
@@ -81,3 +74,45 @@ async def get_current_user(
             detail="Token is invalid",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> User:
+    """Load a user from the database or raise 401."""
+    user = await get_user_by_id(db, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """Retrieve current authenticated user from token.
+
+    Users are served from the principal cache when possible, so the returned
+    object may be detached from ``db``; routes that modify the user must
+    depend on :func:`get_current_user_from_db` instead.
+    """
+    start = time.perf_counter()
+    user_id = _user_id_from_token(token)
+    user = principal_cache.get(user_id)
+    source = "cache"
+    if user is None:
+        user = await _load_user(db, user_id)
+        principal_cache.set(user)
+        source = "db"
+    AUTH_CURRENT_USER_DURATION.observe(time.perf_counter() - start, source)
+    return user
+
+
+async def get_current_user_from_db(
+    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """Retrieve current authenticated user attached to the request session."""
+    user = await _load_user(db, _user_id_from_token(token))
+    principal_cache.set(user)
+    return user
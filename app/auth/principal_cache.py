@@ -0,0 +1,73 @@
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from app.models.models import User
+
+load_dotenv()
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+
+
+class PrincipalCache:
+    """Bounded LRU of authenticated users with a per-entry time to live.
+
+    Entries are plain column snapshots, never ORM instances, so a cached user
+    is not tied to the session that loaded it. Each worker keeps its own cache;
+    the TTL bounds how long another worker can serve a stale principal.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id: int) -> Optional[User]:
+        """Return a detached copy of the cached user, or None on miss."""
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return User(**snapshot)
+
+    def set(self, user: User) -> None:
+        """Cache a snapshot of the user's columns."""
+        if self.max_size <= 0:
+            return
+        snapshot = {
+            "id": user.id,
+            "email": user.email,
+            "hashed_password": user.hashed_password,
+            "created_at": user.created_at,
+        }
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user so the next request reloads it from the database."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached user."""
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL)
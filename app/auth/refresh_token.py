@@ -0,0 +1,31 @@
+import hashlib
+import os
+import secrets
+from datetime import timedelta
+from typing import Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+# 256 random bits: a plain SHA-256 is enough to store them, unlike passwords,
+# so a refresh costs one indexed lookup instead of a bcrypt verify.
+REFRESH_TOKEN_BYTES = 32
+
+
+def refresh_token_lifetime() -> timedelta:
+    """How long a refresh token stays valid after it is issued."""
+    return timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Hex SHA-256 of a refresh token, as stored in the database."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def new_refresh_token() -> Tuple[str, str]:
+    """Generate a refresh token; return it and its hash."""
+    token = secrets.token_urlsafe(REFRESH_TOKEN_BYTES)
+    return token, hash_refresh_token(token)
@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+
+class MemoryCacheBackend:
+    """In-process LRU with a per-entry time to live."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Cache shared by all workers through any Redis-protocol server.
+
+    ``client`` is a ``redis.asyncio.Redis``-compatible object (a fake client
+    works for tests). Entries expire through Redis TTLs.
+    """
+
+    def __init__(self, client, ttl: float, prefix: str = "taskcache"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float) -> "RedisCacheBackend":
+        """Connect with redis-py, which is only needed for this backend."""
+        import redis.asyncio
+
+        return cls(redis.asyncio.from_url(url), ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(f"{self.prefix}:{key}")
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.client.set(
+            f"{self.prefix}:{key}", value, px=max(int(self.ttl * 1000), 1)
+        )
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(f"{self.prefix}:*")]
+        if keys:
+            await self.client.delete(*keys)
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.cache.backends import MemoryCacheBackend, RedisCacheBackend
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TASK_CACHE_BACKEND = os.getenv("TASK_CACHE_BACKEND", "none")
+TASK_CACHE_SIZE = int(os.getenv("TASK_CACHE_SIZE", "10000"))
+TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", "30"))
+TASK_CACHE_REDIS_URL = os.getenv("TASK_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+
+def _normalize(value):
+    """Make a filter value JSON-stable for use in a cache key."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class TaskListCache:
+    """Caches rendered task list pages per user and filter combination.
+
+    Keys combine the normalized filters with the collection version the
+    caller read for its ETag. Every write changes the version, whichever
+    process or replica it is seen from, so writes need not invalidate
+    anything: pages of older versions are never looked up again and age out
+    through the TTL. A hit still costs the version query, which the ETag
+    needs anyway.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def key(self, user_id: int, filters: dict, version: tuple) -> Optional[str]:
+        """Build the cache key for a page of the given collection ``version``."""
+        if not self.enabled:
+            return None
+        normalized = json.dumps(
+            {
+                "filters": {
+                    name: _normalize(value) for name, value in filters.items()
+                },
+                "version": [_normalize(value) for value in version],
+            },
+            sort_keys=True,
+        )
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return f"tasks:{user_id}:{digest}"
+
+    async def get(self, key: Optional[str]) -> Optional[Tuple[bytes, str]]:
+        """Return ``(body, next_cursor)`` cached under ``key``, or None."""
+        if key is None:
+            return None
+        try:
+            value = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            logger.warning("Task cache read failed", exc_info=True)
+            return None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        next_cursor, _, body = value.partition(b"\n")
+        return body, next_cursor.decode()
+
+    async def set(self, key: Optional[str], body: bytes, next_cursor: str = "") -> None:
+        """Store a rendered page; the next cursor is kept alongside the body."""
+        if key is None:
+            return
+        try:
+            await self.backend.set(key, next_cursor.encode() + b"\n" + body)
+        except Exception:
+            self.errors += 1
+            logger.warning("Task cache write failed", exc_info=True)
+
+    def stats(self) -> dict:
+        """Return the backend name and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.enabled else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+        }
+
+
+def _backend_from_env():
+    if TASK_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(TASK_CACHE_SIZE, TASK_CACHE_TTL)
+    if TASK_CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(TASK_CACHE_REDIS_URL, TASK_CACHE_TTL)
+    return None
+
+
+task_list_cache = TaskListCache(_backend_from_env())
@@ -0,0 +1,262 @@
+"""Response compression negotiated with ``Accept-Encoding``.
+
+Complete bodies under ``COMPRESSION_MIN_SIZE`` bytes are sent as they are,
+since the framing overhead outweighs the saving. Streaming bodies are
+compressed chunk by chunk and each chunk is flushed, so exports reach the
+client as they are produced instead of after the last row.
+"""
+
+import os
+import zlib
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.metrics.instruments import COMPRESSION_BYTES
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+load_dotenv()
+
+# Server preference, best first; encodings whose module is missing are
+# skipped. Empty disables compression.
+COMPRESSION_ENCODINGS = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Higher levels trade CPU for bandwidth: gzip 1-9, brotli 0-11, zstd 1-22.
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson")
+# Events must reach the client the moment they are sent; proxies buffering
+# compressed streams would hold them back.
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+class GzipCompressor:
+    """gzip stream through zlib, always available."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    """Brotli stream, when the ``brotli`` package is installed."""
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    """Zstandard stream, when the ``zstandard`` package is installed."""
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings(names: str = COMPRESSION_ENCODINGS) -> Dict[str, object]:
+    """Compressor factories for the configured encodings that can be loaded."""
+    factories = {
+        "zstd": (zstandard, lambda: ZstdCompressor(COMPRESSION_ZSTD_LEVEL)),
+        "br": (brotli, lambda: BrotliCompressor(COMPRESSION_BROTLI_LEVEL)),
+        "gzip": (zlib, lambda: GzipCompressor(COMPRESSION_GZIP_LEVEL)),
+    }
+    encodings = {}
+    for name in filter(None, (part.strip() for part in names.split(","))):
+        module, factory = factories.get(name, (None, None))
+        if module is not None:
+            encodings[name] = factory
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """Pick the encoding with the highest ``q`` the client sent.
+
+    Ties go to the first in ``encodings``; ``None`` means the client accepts
+    none of them.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            weights[coding] = quality
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a media type is text-like and worth compressing."""
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type in UNCOMPRESSED_TYPES:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+    )
+
+
+def mark_negotiated(headers: MutableHeaders) -> None:
+    """Flag a response whose bytes depend on ``Accept-Encoding``.
+
+    Adds ``Vary: Accept-Encoding`` and weakens a strong ETag, since the same
+    version of a resource can now be sent in several encodings;
+    ``If-None-Match`` matching already ignores the ``W/``.
+    """
+    headers.add_vary_header("Accept-Encoding")
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing text-like responses the client accepts.
+
+    The start message is held back until the first body chunk shows whether
+    the response is complete and large enough. Once an encoding is
+    negotiated, every compressible response and every 304 is marked with
+    :func:`mark_negotiated`, whether or not its body ends up compressed, so
+    a URL carries the same ``Vary`` and ETag form at any body size.
+    """
+
+    def __init__(
+        self,
+        app,
+        encodings: Optional[Dict[str, object]] = None,
+        min_size: int = COMPRESSION_MIN_SIZE,
+    ):
+        self.app = app
+        self.encodings = available_encodings() if encodings is None else encodings
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept_encoding, list(self.encodings))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+        original_size = compressed_size = 0
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough, original_size, compressed_size
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if message["status"] == 304:
+                    # Carries the validators of the 200 it stands for.
+                    mark_negotiated(headers)
+                    passthrough = True
+                    await send(message)
+                elif (
+                    "content-encoding" in headers
+                    or message["status"] < 200
+                    or message["status"] == 204
+                    or not is_compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    mark_negotiated(headers)
+                    start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                declared = headers.get("content-length")
+                if (not more_body and len(body) < self.min_size) or (
+                    declared is not None and int(declared) < self.min_size
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = self.encodings[encoding]()
+                del headers["content-length"]
+                headers["content-encoding"] = encoding
+                if not more_body:
+                    data = compressor.compress(body) + compressor.finish()
+                    headers["content-length"] = str(len(data))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data})
+                    COMPRESSION_BYTES.inc(encoding, "original", amount=len(body))
+                    COMPRESSION_BYTES.inc(encoding, "compressed", amount=len(data))
+                    return
+                await send(start)
+
+            data = compressor.compress(body)
+            data += compressor.flush() if more_body else compressor.finish()
+            if not data and more_body:
+                return
+            original_size += len(body)
+            compressed_size += len(data)
+            await send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+            if not more_body:
+                COMPRESSION_BYTES.inc(encoding, "original", amount=original_size)
+                COMPRESSION_BYTES.inc(encoding, "compressed", amount=compressed_size)
+
+        await self.app(scope, receive, send_compressed)
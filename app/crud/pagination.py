@@ -0,0 +1,141 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.models import Task
+
+
+def _pack(payload: dict) -> str:
+    """Serialize a cursor payload into an opaque URL-safe token."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _unpack(cursor: str) -> dict:
+    """Reverse :func:`_pack`; raises ``ValueError`` on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except binascii.Error as exc:
+        raise ValueError(str(exc))
+    if not isinstance(payload, dict):
+        raise ValueError("Cursor payload must be an object")
+    return payload
+
+
+def normalize_order(order_by: str, order_dir: str) -> tuple:
+    """Coerce unknown sort options to the defaults used for task listings."""
+    if order_by not in {"created_at", "deadline"}:
+        order_by = "created_at"
+    if order_dir != "desc":
+        order_dir = "asc"
+    return order_by, order_dir
+
+
+def encode_cursor(value: Any, task_id: int, order_by: str, order_dir: str) -> str:
+    """Build an opaque cursor pointing just past the row at ``(value, task_id)``."""
+    payload = {
+        "o": order_by,
+        "d": order_dir,
+        "v": value.isoformat() if value is not None else None,
+        "id": task_id,
+    }
+    return _pack(payload)
+
+
+def decode_cursor(cursor: str, order_by: str, order_dir: str) -> tuple:
+    """Decode a cursor into its (sort value, id) position or raise 400."""
+    try:
+        payload = _unpack(cursor)
+        value = payload["v"]
+        if value is not None:
+            value = datetime.fromisoformat(value)
+        task_id = int(payload["id"])
+        cursor_order = (payload["o"], payload["d"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_order != (order_by, order_dir):
+        raise HTTPException(
+            status_code=400, detail="Cursor does not match the requested ordering"
+        )
+    return value, task_id
+
+
+def keyset_order(order_by: str, order_dir: str, source: Any = Task) -> list:
+    """Return ORDER BY clauses matching the (owner_id, column, id) indexes.
+
+    NULLs sort last ascending and first descending, which is PostgreSQL's
+    native order for a b-tree scanned in either direction. ``source`` is
+    anything with task columns as attributes: a model, alias or ``.c``.
+    """
+    column = getattr(source, order_by)
+    if order_dir == "desc":
+        return [column.desc().nulls_first(), source.id.desc()]
+    return [column.asc().nulls_last(), source.id.asc()]
+
+
+def keyset_predicates(
+    order_by: str,
+    order_dir: str,
+    value: Optional[Any],
+    task_id: int,
+    source: Any = Task,
+) -> List[ColumnElement]:
+    """Return WHERE clauses selecting rows strictly after the cursor.
+
+    Each clause is one contiguous range of the ``(owner_id, column, id)``
+    index, and the list is in sort order: a page is the first clause's rows,
+    then the second's. Non-NULL positions use a row-value comparison, which
+    the planner turns into an index bound so a deep page costs as much as the
+    first; the NULL part of the column is a separate range, since OR-ing it
+    in would leave only ``owner_id`` to bound the scan.
+    """
+    column = getattr(source, order_by)
+    position = tuple_(column, source.id)
+    if order_dir == "desc":
+        if value is None:
+            return [and_(column.is_(None), source.id < task_id), column.is_not(None)]
+        return [position < (value, task_id)]
+    if value is None:
+        return [and_(column.is_(None), source.id > task_id)]
+    return [position > (value, task_id), column.is_(None)]
+
+
+def encode_search_cursor(score: Optional[float], task_id: int) -> str:
+    """Build an opaque cursor for ranked search results."""
+    return _pack({"s": score, "id": task_id})
+
+
+def decode_search_cursor(cursor: str) -> tuple:
+    """Decode a search cursor into its (score, id) position or raise 400."""
+    try:
+        payload = _unpack(cursor)
+        score = payload["s"]
+        if score is not None:
+            score = float(score)
+        task_id = int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return score, task_id
+
+
+def encode_change_cursor(changed_at: datetime, task_id: int) -> str:
+    """Build an opaque change-feed cursor pointing just past a change."""
+    return _pack({"t": changed_at.isoformat(), "id": task_id})
+
+
+def decode_change_cursor(cursor: str) -> tuple:
+    """Decode a change-feed cursor into its (timestamp, id) position or raise 400."""
+    try:
+        payload = _unpack(cursor)
+        changed_at = datetime.fromisoformat(payload["t"])
+        task_id = int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return changed_at, task_id
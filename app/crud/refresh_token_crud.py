@@ -0,0 +1,81 @@
+import logging
+from typing import Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.refresh_token import (
+    hash_refresh_token,
+    new_refresh_token,
+    refresh_token_lifetime,
+)
+from app.models.models import RefreshToken, utc_now
+
+logger = logging.getLogger(__name__)
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: int) -> str:
+    """Start a new session for a user and return its refresh token.
+
+    The user's expired sessions are removed at the same time, so the table
+    only grows with live sessions.
+    """
+    token, token_hash = new_refresh_token()
+    now = utc_now()
+    await db.execute(
+        delete(RefreshToken).where(
+            RefreshToken.user_id == user_id, RefreshToken.expires_at <= now
+        )
+    )
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=token_hash,
+            expires_at=now + refresh_token_lifetime(),
+        )
+    )
+    await db.commit()
+    return token
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[int, str]:
+    """Swap a refresh token for a new one; return the user ID and the new token.
+
+    The swap is a single conditional UPDATE, so of two concurrent refreshes
+    with the same token only one succeeds. Presenting the token that was just
+    rotated out means it was used twice; the session is revoked.
+    """
+    old_hash = hash_refresh_token(token)
+    new_token, new_hash = new_refresh_token()
+    now = utc_now()
+    result = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == old_hash, RefreshToken.expires_at > now)
+        .values(
+            token_hash=new_hash,
+            previous_hash=old_hash,
+            expires_at=now + refresh_token_lifetime(),
+        )
+        .returning(RefreshToken.user_id)
+    )
+    user_id = result.scalar_one_or_none()
+    if user_id is None:
+        result = await db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.previous_hash == old_hash)
+            .returning(RefreshToken.user_id)
+        )
+        replayed_by = result.scalar_one_or_none()
+        await db.commit()
+        if replayed_by is not None:
+            logger.warning(
+                "Reused refresh token for user %s; session revoked", replayed_by
+            )
+        raise HTTPException(
+            status_code=401,
+            detail="Refresh token is invalid or expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    await db.commit()
+    return user_id, new_token
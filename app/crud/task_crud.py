@@ -1,100 +1,873 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import (
+    RowMapping,
+    Select,
+    and_,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.crud.pagination import (
+    decode_change_cursor,
+    decode_cursor,
+    decode_search_cursor,
+    encode_change_cursor,
+    encode_search_cursor,
+    keyset_order,
+    keyset_predicates,
+    normalize_order,
+)
+from app.db.archive import copy_tasks
+from app.db.change_feed import as_utc, retention_horizon, settled_before
+from app.db.fulltext import ranked_match
+from app.db.replicas import mark_write
+from app.events.task_events import (
+    delete_events,
+    resync_events,
+    task_events,
+    upsert_events,
+)
 from app.models.enums import TaskPriority, TaskStatus
-from app.models.models import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.models.models import Task, TaskArchive, TaskCounter, TaskTombstone, utc_now
+from app.scheduler.deadlines import deadline_scheduler
+from app.schemas.task import (
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskResponse,
+    TaskUpdate,
+)
 
+TASK_RESPONSE_COLUMNS = [getattr(Task, field) for field in TaskResponse.model_fields]
+ARCHIVE_RESPONSE_COLUMNS = [
+    getattr(TaskArchive, field) for field in TaskResponse.model_fields
+]
 
-async def get_task_by_id(db: AsyncSession, task_id: int) -> Task:
-    """Fetch a task by its ID or raise 404."""
+
+def _response_columns(model) -> list:
+    """The :class:`TaskResponse` columns of ``Task`` or ``TaskArchive``."""
+    return ARCHIVE_RESPONSE_COLUMNS if model is TaskArchive else TASK_RESPONSE_COLUMNS
+
+
+async def _commit_for(
+    db: AsyncSession,
+    owner_id: int,
+    upserts: Iterable[Task] = (),
+    deletes: Iterable[int] = (),
+    resync: bool = False,
+) -> None:
+    """Commit a change to a user's tasks and run the after-write hooks.
+
+    ``upserts`` and ``deletes`` are published to live subscribers once the
+    commit succeeds; ``resync`` asks them to reload instead, for writes too
+    large to describe task by task. The deadline scheduler is told about the
+    same changes.
+    """
+    await db.commit()
+    await mark_write(owner_id)
+    deadline_scheduler.schedule(upserts)
+    deadline_scheduler.forget(deletes)
+    if resync:
+        deadline_scheduler.reload()
+    events = resync_events() if resync else []
+    events += upsert_events(upserts) + delete_events(deletes)
+    if events:
+        await task_events.publish(owner_id, events)
+
+
+async def get_task_by_id(
+    db: AsyncSession, task_id: int, include_archived: bool = False
+) -> Task:
+    """Fetch a task by its ID or raise 404.
+
+    With ``include_archived``, a task missing from ``tasks`` is looked up in
+    ``tasks_archive`` and returned as a :class:`TaskArchive`.
+    """
     result = await db.execute(select(Task).where(Task.id == task_id))
     task = result.scalar_one_or_none()
+    if task is None and include_archived:
+        result = await db.execute(select(TaskArchive).where(TaskArchive.id == task_id))
+        task = result.scalar_one_or_none()
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
-async def get_tasks_by_user(
+async def get_task_row_by_id(
+    db: AsyncSession, task_id: int, include_archived: bool = False
+) -> RowMapping:
+    """Fetch a task's response columns as a row mapping or raise 404.
+
+    With ``include_archived`` both tables are probed by primary key in one
+    ``UNION ALL`` statement.
+    """
+    query = select(*TASK_RESPONSE_COLUMNS).where(Task.id == task_id)
+    if include_archived:
+        query = union_all(
+            query, select(*ARCHIVE_RESPONSE_COLUMNS).where(TaskArchive.id == task_id)
+        )
+    result = await db.execute(query)
+    row = result.mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return row
+
+
+async def get_task_collection_version(
+    db: AsyncSession, user_id: int, include_archived: bool = False
+) -> Tuple[int, Optional[datetime]]:
+    """Return ``(count, max updated_at)`` of a user's tasks.
+
+    Any create, update or delete changes at least one of the two values, so
+    they identify a version of the collection. Both are answered from the
+    ``(owner_id, updated_at, id)`` index. With ``include_archived`` the count
+    covers archived tasks too, which archival moves but never changes.
+    """
+    query = select(func.count(Task.id), func.max(Task.updated_at)).where(
+        Task.owner_id == user_id
+    )
+    if include_archived:
+        query = query.add_columns(
+            select(func.count(TaskArchive.id))
+            .where(TaskArchive.owner_id == user_id)
+            .scalar_subquery()
+        )
+    count, last_updated, *archived = (await db.execute(query)).one()
+    return count + sum(archived), last_updated
+
+
+async def get_due_tasks(
     db: AsyncSession,
+    user_id: int,
+    within: timedelta,
+    include_overdue: bool = False,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> List[RowMapping]:
+    """Return a user's open tasks due in the next ``within``, soonest first.
+
+    Reads one range of the ``(owner_id, deadline, id)`` index. Overdue tasks
+    are included with ``include_overdue``. ``cursor`` continues after the
+    last task of the previous page.
+    """
+    now = utc_now()
+    query = select(*TASK_RESPONSE_COLUMNS).where(
+        Task.owner_id == user_id,
+        Task.deadline < now + within,
+        Task.status != TaskStatus.DONE,
+    )
+    if not include_overdue:
+        query = query.where(Task.deadline >= now)
+    if cursor is not None:
+        value, task_id = decode_cursor(cursor, "deadline", "asc")
+        # Deadlines are bounded above, so the NULL range never matches.
+        query = query.where(keyset_predicates("deadline", "asc", value, task_id)[0])
+    query = query.order_by(*keyset_order("deadline", "asc")).limit(limit)
+    result = await db.execute(query)
+    return result.mappings().all()
+
+
+async def get_task_stats(db: AsyncSession, user_id: int) -> dict:
+    """Return a user's task counts by status and priority plus deadline counts.
+
+    Status and priority totals come from the trigger-maintained
+    ``task_counters`` rows and include archived tasks. Overdue and due-today
+    depend on the clock, so they are counted at read time over the
+    ``(owner_id, deadline, id)`` index, touching only open tasks due before
+    the end of the current UTC day.
+    """
+    by_status = dict.fromkeys(TaskStatus, 0)
+    by_priority = dict.fromkeys(TaskPriority, 0)
+    result = await db.execute(
+        select(TaskCounter.dimension, TaskCounter.value, TaskCounter.count).where(
+            TaskCounter.owner_id == user_id
+        )
+    )
+    for dimension, value, count in result:
+        if dimension == "status" and value in TaskStatus.__members__:
+            by_status[TaskStatus[value]] = count
+        elif dimension == "priority" and value in TaskPriority.__members__:
+            by_priority[TaskPriority[value]] = count
+
+    now = utc_now()
+    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    end_of_day = start_of_day + timedelta(days=1)
+    result = await db.execute(
+        select(
+            func.count(Task.id).filter(Task.deadline < now),
+            func.count(Task.id).filter(Task.deadline >= start_of_day),
+        ).where(
+            Task.owner_id == user_id,
+            Task.deadline < end_of_day,
+            Task.status != TaskStatus.DONE,
+        )
+    )
+    overdue, due_today = result.one()
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "overdue": overdue,
+        "due_today": due_today,
+    }
+
+
+def _user_tasks_query(
     user_id: int,
     status: Optional[TaskStatus] = None,
     priority: Optional[TaskPriority] = None,
     deadline_before: Optional[datetime] = None,
     deadline_after: Optional[datetime] = None,
-    limit: int = 100,
-    offset: int = 0,
-    order_by: str = "created_at",
-    order_dir: str = "desc",
     show_completed: bool = True,
-) -> List[Task]:
-    """Return all tasks for a specific user, with optional filters and sorting."""
-    query = select(Task).where(Task.owner_id == user_id)
+    model=Task,
+) -> Select:
+    """Build the filtered SELECT shared by task listings and exports.
+
+    ``model`` is ``Task`` or ``TaskArchive``, the table to read.
+    """
+    query = select(model).where(model.owner_id == user_id)
 
     if not show_completed:
-        query = query.where(Task.status != TaskStatus.DONE)
+        query = query.where(model.status != TaskStatus.DONE)
     if status is not None:
-        query = query.where(Task.status == status)
+        query = query.where(model.status == status)
     if priority is not None:
-        query = query.where(Task.priority == priority)
+        query = query.where(model.priority == priority)
     if deadline_before is not None:
-        query = query.where(Task.deadline <= deadline_before)
+        query = query.where(model.deadline <= deadline_before)
     if deadline_after is not None:
-        query = query.where(Task.deadline >= deadline_after)
+        query = query.where(model.deadline >= deadline_after)
+    return query
 
-    if order_by not in {"created_at", "deadline"}:
-        order_by = "created_at"
-    order_column = getattr(Task, order_by)
-    if order_dir == "desc":
-        query = query.order_by(order_column.desc())
+
+def _user_tasks_page_query(
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    deadline_before: Optional[datetime] = None,
+    deadline_after: Optional[datetime] = None,
+    limit: int = 100,
+    offset: int = 0,
+    order_by: str = "created_at",
+    order_dir: str = "desc",
+    show_completed: bool = True,
+    cursor: Optional[str] = None,
+    model=Task,
+    columns: Optional[list] = None,
+) -> Select:
+    """Build the ordered, paginated SELECT for one page of a user's tasks.
+
+    Selects ``model`` entities, or only ``columns`` of it when given. When
+    the rows after the cursor span two index ranges, each range is read as
+    its own limited page and the union of the two is cut once more.
+    """
+    query = _user_tasks_query(
+        user_id,
+        status,
+        priority,
+        deadline_before,
+        deadline_after,
+        show_completed,
+        model=model,
+    )
+    if columns is not None:
+        query = query.with_only_columns(*columns)
+
+    order_by, order_dir = normalize_order(order_by, order_dir)
+    order = keyset_order(order_by, order_dir, model)
+    if cursor is None:
+        return query.order_by(*order).offset(offset).limit(limit)
+
+    value, task_id = decode_cursor(cursor, order_by, order_dir)
+    pages = [
+        query.where(predicate).order_by(*order).limit(limit)
+        for predicate in keyset_predicates(order_by, order_dir, value, task_id, model)
+    ]
+    if len(pages) == 1:
+        return pages[0]
+    merged = union_all(*(select(page.subquery()) for page in pages)).subquery()
+    if columns is None:
+        source = aliased(model, merged)
+        query = select(source)
     else:
-        query = query.order_by(order_column.asc())
+        source = merged.c
+        query = select(merged)
+    return query.order_by(*keyset_order(order_by, order_dir, source)).limit(limit)
 
-    query = query.offset(offset).limit(limit)
+
+def _reads_archive(
+    include_archived: bool,
+    show_completed: bool = True,
+    status: Optional[TaskStatus] = None,
+) -> bool:
+    """Whether a listing has to read ``tasks_archive`` as well as ``tasks``.
+
+    Only completed tasks are archived, so the archive is skipped unless the
+    caller asks for it and the filters can match a completed task.
+    """
+    return include_archived and show_completed and status in (None, TaskStatus.DONE)
+
+
+def _archived_page_query(
+    user_id: int,
+    limit: int = 100,
+    offset: int = 0,
+    order_by: str = "created_at",
+    order_dir: str = "desc",
+    cursor: Optional[str] = None,
+    as_tasks: bool = False,
+    **filters,
+) -> Select:
+    """Build one page of a user's tasks over ``tasks`` and ``tasks_archive``.
+
+    Each table contributes its own page, read from its ``(owner_id, column,
+    id)`` index with the same keyset, and the union of the two is sorted and
+    cut once more. Selects the :class:`TaskResponse` columns, or ``Task``
+    entities when ``as_tasks`` is set.
+    """
+    order_by, order_dir = normalize_order(order_by, order_dir)
+    # Without a cursor, any of the first offset + limit rows of either table
+    # may end up on the page.
+    per_table = limit if cursor is not None else offset + limit
+    pages = [
+        select(
+            _user_tasks_page_query(
+                user_id,
+                limit=per_table,
+                order_by=order_by,
+                order_dir=order_dir,
+                cursor=cursor,
+                model=model,
+                columns=_response_columns(model),
+                **filters,
+            ).subquery()
+        )
+        for model in (Task, TaskArchive)
+    ]
+    merged = union_all(*pages).subquery("task_pages")
+    if as_tasks:
+        source = aliased(Task, merged)
+        query = select(source)
+    else:
+        source = merged.c
+        query = select(merged)
+    query = query.order_by(*keyset_order(order_by, order_dir, source)).limit(limit)
+    if cursor is None:
+        query = query.offset(offset)
+    return query
+
+
+async def get_tasks_by_user(
+    db: AsyncSession,
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    deadline_before: Optional[datetime] = None,
+    deadline_after: Optional[datetime] = None,
+    limit: int = 100,
+    offset: int = 0,
+    order_by: str = "created_at",
+    order_dir: str = "desc",
+    show_completed: bool = True,
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+) -> List[Task]:
+    """Return all tasks for a specific user, with optional filters and sorting.
+
+    When ``cursor`` is given, the page starts right after the cursor position
+    (keyset pagination) and ``offset`` is ignored. Archived tasks are only
+    read with ``include_archived``, and only if the filters allow completed
+    tasks.
+    """
+    filters = {
+        "status": status,
+        "priority": priority,
+        "deadline_before": deadline_before,
+        "deadline_after": deadline_after,
+        "limit": limit,
+        "offset": offset,
+        "order_by": order_by,
+        "order_dir": order_dir,
+        "show_completed": show_completed,
+        "cursor": cursor,
+    }
+    if _reads_archive(include_archived, show_completed, status):
+        query = _archived_page_query(user_id, as_tasks=True, **filters)
+    else:
+        query = _user_tasks_page_query(user_id, **filters)
     result = await db.execute(query)
     tasks = result.scalars().all()
     return tasks
 
 
+async def get_task_rows_by_user(
+    db: AsyncSession, user_id: int, include_archived: bool = False, **filters
+) -> List[RowMapping]:
+    """Like :func:`get_tasks_by_user`, but return plain row mappings.
+
+    Takes the same keyword arguments. Only the columns of
+    :class:`TaskResponse` are selected and no ORM objects are built, which
+    makes this the cheap path for serializing large pages.
+    """
+    if _reads_archive(
+        include_archived, filters.get("show_completed", True), filters.get("status")
+    ):
+        query = _archived_page_query(user_id, **filters)
+    else:
+        query = _user_tasks_page_query(
+            user_id, columns=TASK_RESPONSE_COLUMNS, **filters
+        )
+    result = await db.execute(query)
+    return result.mappings().all()
+
+
+async def stream_tasks_by_user(
+    db: AsyncSession,
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    deadline_before: Optional[datetime] = None,
+    deadline_after: Optional[datetime] = None,
+    order_by: str = "created_at",
+    order_dir: str = "asc",
+    show_completed: bool = True,
+    batch_size: int = 500,
+) -> AsyncIterator[List[Task]]:
+    """Yield all matching tasks in batches using a server-side cursor.
+
+    At most ``batch_size`` rows are held in memory at a time, however many
+    tasks the user has.
+    """
+    query = _user_tasks_query(
+        user_id, status, priority, deadline_before, deadline_after, show_completed
+    )
+    order_by, order_dir = normalize_order(order_by, order_dir)
+    query = query.order_by(*keyset_order(order_by, order_dir)).execution_options(
+        yield_per=batch_size
+    )
+    result = await db.stream_scalars(query)
+    async for batch in result.partitions():
+        yield batch
+
+
 async def create_task(db: AsyncSession, task_data: TaskCreate, owner_id: int) -> Task:
     """Create a new task for a user."""
     new_task = Task(**task_data.model_dump(exclude_unset=True), owner_id=owner_id)
     db.add(new_task)
-    await db.commit()
+    await _commit_for(db, owner_id, upserts=[new_task])
     await db.refresh(new_task)
     return new_task
 
 
-async def update_task(db: AsyncSession, task_id: int, task_data: TaskUpdate) -> Task:
-    """Update fields of an existing task."""
-    task = await get_task_by_id(db, task_id)
+def _new_task_rows(tasks_data: List[TaskCreate], owner_id: int) -> List[dict]:
+    """Build INSERT parameter sets for new tasks sharing one timestamp."""
+    now = utc_now()
+    return [
+        {
+            **task_data.model_dump(),
+            "owner_id": owner_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for task_data in tasks_data
+    ]
+
+
+async def create_tasks(
+    db: AsyncSession, tasks_data: List[TaskCreate], owner_id: int
+) -> List[Task]:
+    """Create many tasks with one multi-row INSERT ... RETURNING.
+
+    Returned tasks are in the same order as ``tasks_data``.
+    """
+    result = await db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True),
+        _new_task_rows(tasks_data, owner_id),
+    )
+    tasks = result.all()
+    await _commit_for(db, owner_id, upserts=tasks)
+    return tasks
+
+
+async def insert_tasks(
+    db: AsyncSession, tasks_data: List[TaskCreate], owner_id: int, resync: bool = True
+) -> int:
+    """Insert and commit a batch of tasks without reading them back.
+
+    Callers inserting many batches pass ``resync=False`` and call
+    :func:`publish_resync` once at the end.
+    """
+    await db.execute(insert(Task), _new_task_rows(tasks_data, owner_id))
+    await _commit_for(db, owner_id, resync=resync)
+    return len(tasks_data)
+
+
+async def publish_resync(owner_id: int) -> None:
+    """Ask live subscribers and the deadline scheduler to reload a user's tasks."""
+    deadline_scheduler.reload()
+    await task_events.publish(owner_id, resync_events())
+
+
+async def update_tasks(
+    db: AsyncSession, items: List[TaskBulkUpdateItem], owner_id: int
+) -> Tuple[List[Task], List[int]]:
+    """Apply many partial updates to a user's tasks in one transaction.
+
+    Runs an executemany UPDATE scoped to ``owner_id`` and reads the affected
+    rows back with a single SELECT. Returns the updated tasks and the IDs of
+    requested tasks that are archived, which are left unchanged; tasks that
+    do not exist or belong to someone else are in neither.
+    """
+    now = utc_now()
+    rows = [
+        {
+            **item.model_dump(exclude_unset=True, exclude={"id"}),
+            "id": item.id,
+            "updated_at": now,
+        }
+        for item in items
+    ]
+    await db.execute(
+        update(Task)
+        .where(Task.owner_id == owner_id)
+        .execution_options(synchronize_session=False),
+        rows,
+    )
+    result = await db.execute(
+        select(Task)
+        .where(Task.id.in_({item.id for item in items}), Task.owner_id == owner_id)
+        .execution_options(populate_existing=True)
+    )
+    tasks = result.scalars().all()
+    missing = {item.id for item in items} - {task.id for task in tasks}
+    archived_ids = []
+    if missing:
+        result = await db.execute(
+            select(TaskArchive.id).where(
+                TaskArchive.id.in_(missing), TaskArchive.owner_id == owner_id
+            )
+        )
+        archived_ids = result.scalars().all()
+    await _commit_for(db, owner_id, upserts=tasks)
+    return tasks, archived_ids
+
+
+async def _record_tombstones(
+    db: AsyncSession, task_ids: List[int], owner_id: int
+) -> None:
+    """Leave a tombstone for each deleted task in the current transaction."""
+    if not task_ids:
+        return
+    now = utc_now()
+    await db.execute(
+        insert(TaskTombstone),
+        [
+            {"task_id": task_id, "owner_id": owner_id, "deleted_at": now}
+            for task_id in task_ids
+        ],
+    )
+
+
+async def delete_tasks(
+    db: AsyncSession, task_ids: List[int], owner_id: int
+) -> List[int]:
+    """Delete many of a user's tasks in one statement; return the deleted IDs."""
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id.in_(set(task_ids)), Task.owner_id == owner_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_ids = result.scalars().all()
+    missing = set(task_ids) - set(deleted_ids)
+    if missing:
+        result = await db.execute(
+            delete(TaskArchive)
+            .where(TaskArchive.id.in_(missing), TaskArchive.owner_id == owner_id)
+            .returning(TaskArchive.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids += result.scalars().all()
+    await _record_tombstones(db, deleted_ids, owner_id)
+    await _commit_for(db, owner_id, deletes=deleted_ids)
+    return deleted_ids
+
+
+async def _raise_missing_or_forbidden(
+    db: AsyncSession, task_id: int, owner_id: int, action: str
+):
+    """Explain why an owner-scoped statement matched no row.
+
+    404 if the task exists in neither table, 403 if someone else owns it and
+    409 if the caller owns it but it is on the wrong side of the archive.
+    """
+    result = await db.execute(
+        union_all(
+            select(Task.owner_id, literal(False).label("archived")).where(
+                Task.id == task_id
+            ),
+            select(TaskArchive.owner_id, literal(True).label("archived")).where(
+                TaskArchive.id == task_id
+            ),
+        )
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if row.owner_id == owner_id:
+        detail = "Task is archived" if row.archived else "Task is not archived"
+        raise HTTPException(status_code=409, detail=detail)
+    raise HTTPException(status_code=403, detail=f"Not allowed to {action} this task")
+
+
+async def update_task(
+    db: AsyncSession, task_id: int, task_data: TaskUpdate, owner_id: int
+) -> Task:
+    """Update fields of a task owned by ``owner_id`` in a single statement.
+
+    Issues ``UPDATE ... WHERE id AND owner_id RETURNING *``; only when no row
+    matches is a second query run to tell a missing task from a foreign one.
+    """
     update_data = task_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(task, key, value)
-    await db.commit()
-    await db.refresh(task)
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .values(**update_data, updated_at=utc_now())
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    task = result.scalar_one_or_none()
+    if task is None:
+        await _raise_missing_or_forbidden(db, task_id, owner_id, "update")
+    await _commit_for(db, owner_id, upserts=[task])
     return task
 
 
-async def delete_task(db: AsyncSession, task_id: int):
-    """Delete a task by its ID."""
-    task = await get_task_by_id(db, task_id)
-    await db.delete(task)
-    await db.commit()
+async def delete_task(db: AsyncSession, task_id: int, owner_id: int):
+    """Delete a task owned by ``owner_id`` in a single statement.
 
+    A task missing from ``tasks`` is deleted from ``tasks_archive`` instead.
+    """
+    stmt = (
+        delete(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    if result.scalar_one_or_none() is None:
+        result = await db.execute(
+            delete(TaskArchive)
+            .where(TaskArchive.id == task_id, TaskArchive.owner_id == owner_id)
+            .returning(TaskArchive.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
+            await _raise_missing_or_forbidden(db, task_id, owner_id, "delete")
+    await _record_tombstones(db, [task_id], owner_id)
+    await _commit_for(db, owner_id, deletes=[task_id])
 
-async def search_tasks(
-    db: AsyncSession, owner_id: int, title: str = None, description: str = None
-) -> List[Task]:
-    """Search for tasks by title and/or description."""
-    query = select(Task).where(Task.owner_id == owner_id)
+
+async def restore_task(db: AsyncSession, task_id: int, owner_id: int) -> Task:
+    """Move an archived task owned by ``owner_id`` back into ``tasks``.
+
+    ``updated_at`` is bumped so the change feed and live subscribers pick the
+    task up again, and the archival job leaves it alone for another full age.
+    """
+    owned = (TaskArchive.id == task_id, TaskArchive.owner_id == owner_id)
+    result = await db.execute(copy_tasks(TaskArchive, Task, *owned))
+    if not result.rowcount:
+        await _raise_missing_or_forbidden(db, task_id, owner_id, "restore")
+    await db.execute(delete(TaskArchive).where(*owned))
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(updated_at=utc_now())
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.scalar_one()
+    await _commit_for(db, owner_id, upserts=[task])
+    return task
+
+
+async def get_task_changes(
+    db: AsyncSession, user_id: int, since: Optional[str] = None, limit: int = 500
+) -> Tuple[List[dict], Optional[str], bool]:
+    """Return a user's task changes after ``since``, oldest first.
+
+    Upserts come from the ``(owner_id, updated_at, id)`` index and deletes
+    from the matching tombstone index; each side is read with the same keyset
+    and merged, so the cost follows the number of changes, not of tasks.
+    Returns ``(changes, next_cursor, has_more)``. A cursor older than the
+    tombstone retention horizon gets 410, since deletes may have been lost.
+    """
+    position = None
+    if since is not None:
+        position = decode_change_cursor(since)
+        if as_utc(position[0]) < retention_horizon():
+            raise HTTPException(
+                status_code=410, detail="Cursor expired; resync from scratch"
+            )
+    until = settled_before()
+
+    upserts = select(*TASK_RESPONSE_COLUMNS).where(
+        Task.owner_id == user_id, Task.updated_at < until
+    )
+    deletes = select(TaskTombstone.task_id, TaskTombstone.deleted_at).where(
+        TaskTombstone.owner_id == user_id, TaskTombstone.deleted_at < until
+    )
+    if position is not None:
+        changed_at, task_id = position
+        upserts = upserts.where(
+            or_(
+                Task.updated_at > changed_at,
+                and_(Task.updated_at == changed_at, Task.id > task_id),
+            )
+        )
+        deletes = deletes.where(
+            or_(
+                TaskTombstone.deleted_at > changed_at,
+                and_(
+                    TaskTombstone.deleted_at == changed_at,
+                    TaskTombstone.task_id > task_id,
+                ),
+            )
+        )
+    upserts = upserts.order_by(Task.updated_at, Task.id).limit(limit + 1)
+    deletes = deletes.order_by(TaskTombstone.deleted_at, TaskTombstone.task_id).limit(
+        limit + 1
+    )
+    upsert_rows = (await db.execute(upserts)).mappings().all()
+    delete_rows = (await db.execute(deletes)).all()
+
+    changes = [
+        {"op": "upsert", "id": row["id"], "changed_at": row["updated_at"], "task": row}
+        for row in upsert_rows
+    ] + [
+        {"op": "delete", "id": row.task_id, "changed_at": row.deleted_at}
+        for row in delete_rows
+    ]
+    changes.sort(key=lambda change: (as_utc(change["changed_at"]), change["id"]))
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    next_cursor = since
+    if changes:
+        last = changes[-1]
+        next_cursor = encode_change_cursor(last["changed_at"], last["id"])
+    return changes, next_cursor, has_more
+
+
+def _search_query(
+    dialect_name: str,
+    model,
+    owner_id: int,
+    q: Optional[str] = None,
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> tuple:
+    """Build the ordered search over ``Task`` or ``TaskArchive``.
+
+    Returns ``(query, score)``; ``score`` is None when results are not ranked.
+    """
+    query = select(model).where(model.owner_id == owner_id)
     if title:
-        query = query.where(Task.title.ilike(f"%{title}%"))
+        query = query.where(model.title.ilike(f"%{title}%"))
     if description:
-        query = query.where(Task.description.ilike(f"%{description}%"))
-    result = await db.execute(query)
-    return result.scalars().all()
+        query = query.where(model.description.ilike(f"%{description}%"))
+
+    score = None
+    match = ranked_match(dialect_name, q, model.__tablename__) if q else None
+    if match is not None:
+        score, where, join = match
+        if where is not None:
+            query = query.where(where)
+        if join is not None:
+            query = query.join(join, join.c.task_id == model.id)
+        query = query.add_columns(score).order_by(score.desc(), model.id.desc())
+    elif q:
+        pattern = f"%{q}%"
+        query = query.where(
+            or_(model.title.ilike(pattern), model.description.ilike(pattern))
+        )
+
+    if score is None:
+        query = query.order_by(model.id.desc())
+
+    if cursor is not None:
+        cursor_score, task_id = decode_search_cursor(cursor)
+        if score is not None and cursor_score is not None:
+            query = query.where(
+                or_(
+                    score < cursor_score,
+                    and_(score == cursor_score, model.id < task_id),
+                )
+            )
+        else:
+            query = query.where(model.id < task_id)
+    return query, score
+
+
+async def search_tasks(
+    db: AsyncSession,
+    owner_id: int,
+    q: Optional[str] = None,
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+) -> Tuple[List[Task], Optional[str]]:
+    """Search a user's tasks and return one page plus the next-page cursor.
+
+    ``q`` runs a ranked full-text query over title and description (tsvector
+    on PostgreSQL, FTS5 on SQLite). ``title`` and ``description`` remain
+    substring filters. Without ``q`` results are ordered newest first.
+    With ``include_archived`` the archive is searched with the same query and
+    both result pages are merged in one statement; on SQLite each table's
+    FTS5 index ranks against its own statistics, so merged scores are close
+    but not exactly comparable.
+    """
+    dialect_name = db.get_bind().dialect.name
+    search = (owner_id, q, title, description, cursor)
+    query, score = _search_query(dialect_name, Task, *search)
+    if include_archived:
+        pages = []
+        for model in (Task, TaskArchive):
+            page, page_score = _search_query(dialect_name, model, *search)
+            columns = _response_columns(model)
+            if page_score is not None:
+                columns = [*columns, page_score.label("score")]
+            pages.append(
+                select(page.with_only_columns(*columns).limit(limit).subquery())
+            )
+        merged = union_all(*pages).subquery("search_pages")
+        query = select(aliased(Task, merged))
+        if score is not None:
+            score = merged.c.score
+            query = query.add_columns(score).order_by(score.desc())
+        query = query.order_by(merged.c.id.desc())
+
+    result = await db.execute(query.limit(limit))
+    rows = result.all()
+    tasks = [row[0] for row in rows]
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        last_score = last[1] if score is not None else None
+        next_cursor = encode_search_cursor(last_score, last[0].id)
+    return tasks, next_cursor
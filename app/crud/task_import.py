@@ -0,0 +1,237 @@
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, Deque, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.task_crud import insert_tasks, publish_resync
+from app.schemas.task import TaskCreate
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_ERRORS = 100
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+
+
+class RecordError(ValueError):
+    """A single import record could not be parsed."""
+
+
+async def _lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """Split a byte stream into numbered text lines without buffering it all.
+
+    Only the unfinished tail of the stream is kept between chunks. Lines
+    longer than ``IMPORT_MAX_LINE_BYTES`` are dropped as they arrive and
+    yielded as ``None``.
+    """
+    pending = bytearray()
+    too_long = False
+    number = 0
+    async for chunk in chunks:
+        *complete, rest = chunk.split(b"\n")
+        for part in complete:
+            number += 1
+            if too_long or len(pending) + len(part) > IMPORT_MAX_LINE_BYTES:
+                yield number, None
+            else:
+                pending += part
+                yield number, pending.decode("utf-8", errors="replace")
+            pending.clear()
+            too_long = False
+        if not too_long:
+            pending += rest
+            if len(pending) > IMPORT_MAX_LINE_BYTES:
+                pending.clear()
+                too_long = True
+    if too_long:
+        yield number + 1, None
+    elif pending:
+        yield number + 1, pending.decode("utf-8", errors="replace")
+
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """Yield ``(line, record or RecordError)`` for each non-blank NDJSON line."""
+    async for number, line in _lines(chunks):
+        if line is None:
+            yield number, RecordError("Line too long")
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, RecordError("Invalid JSON")
+            continue
+        if not isinstance(record, dict):
+            yield number, RecordError("Expected a JSON object")
+            continue
+        yield number, record
+
+
+class _NeedMoreLines(Exception):
+    """The CSV record being read continues past the lines received so far."""
+
+
+class _LineFeed:
+    """Line iterator for one ``csv.reader`` fed from an async stream.
+
+    Running out of lines mid-record raises :class:`_NeedMoreLines` instead
+    of ending the reader; the lines of that record are kept so it can be
+    read again once more input has arrived.
+    """
+
+    def __init__(self):
+        self.lines: Deque[Tuple[int, str]] = deque()
+        self.record: List[Tuple[int, str]] = []
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            if self.closed:
+                raise StopIteration
+            raise _NeedMoreLines
+        line = self.lines.popleft()
+        self.record.append(line)
+        return line[1] + "\n"
+
+    def rewind(self) -> None:
+        """Put the lines of the unfinished record back in front."""
+        self.lines.extendleft(reversed(self.record))
+        self.record = []
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """Yield ``(line, record or RecordError)`` for each CSV row after the header.
+
+    A single ``csv.reader`` parses the stream, so quoted fields may contain
+    newlines and bare quotes inside unquoted fields are accepted. Empty cells
+    are treated as missing.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed, strict=True)
+    header = None
+    # After an incomplete record, wait until the buffer has doubled before
+    # reading it again, so a long multi-line field is parsed a bounded
+    # number of times.
+    retry_at = 0
+
+    def read_rows() -> Iterator[tuple]:
+        nonlocal retry_at
+        while feed.lines or feed.closed:
+            feed.record = []
+            try:
+                row = next(reader)
+            except _NeedMoreLines:
+                retry_at = 2 * len(feed.record)
+                feed.rewind()
+                return
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                start = feed.record[0][0] if feed.record else 0
+                if feed.closed and not feed.lines:
+                    # Strict mode reports an open quoted field at the end.
+                    yield start, RecordError("Unterminated quoted field")
+                    return
+                yield start, RecordError(f"Invalid CSV: {exc}")
+                continue
+            yield feed.record[0][0], row
+
+    def records() -> Iterator[tuple]:
+        nonlocal header
+        for start, row in read_rows():
+            if isinstance(row, RecordError):
+                yield start, row
+            elif not row or (len(row) == 1 and not row[0].strip()):
+                continue
+            elif header is None:
+                header = [name.strip() for name in row]
+            elif len(row) != len(header):
+                yield start, RecordError(
+                    f"Expected {len(header)} columns, got {len(row)}"
+                )
+            else:
+                yield start, {
+                    key: value for key, value in zip(header, row) if value != ""
+                }
+
+    async for number, line in _lines(chunks):
+        if line is None:
+            # Read whatever is complete; a record still open runs into the
+            # dropped line and cannot be completed either.
+            for item in records():
+                yield item
+            start = feed.lines[0][0] if feed.lines else number
+            feed.lines.clear()
+            retry_at = 0
+            yield start, RecordError("Line too long")
+            continue
+        feed.lines.append((number, line))
+        if len(feed.lines) >= retry_at:
+            for item in records():
+                yield item
+    feed.closed = True
+    for item in records():
+        yield item
+
+
+def _describe(exc: ValidationError) -> str:
+    """Render a validation error as a single line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def import_tasks(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    import_format: str,
+    owner_id: int,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> dict:
+    """Validate and insert tasks from an NDJSON or CSV byte stream.
+
+    Rows are validated with :class:`TaskCreate` and written in batches of
+    ``batch_size``, each in its own transaction, so neither the file nor the
+    transaction grows with the input. Subscribers and the deadline scheduler
+    are asked to reload once, after the last batch, even if the import stops
+    early. Returns counts of accepted and rejected rows and the first
+    ``IMPORT_MAX_ERRORS`` errors with their line numbers.
+    """
+    parse = _csv_records if import_format == "csv" else _ndjson_records
+    batch: List[TaskCreate] = []
+    accepted = rejected = 0
+    errors = []
+
+    try:
+        async for number, record in parse(chunks):
+            if isinstance(record, RecordError):
+                message = str(record)
+            else:
+                try:
+                    batch.append(TaskCreate.model_validate(record))
+                    message = None
+                except ValidationError as exc:
+                    message = _describe(exc)
+            if message is not None:
+                rejected += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({"line": number, "error": message})
+                continue
+            if len(batch) >= batch_size:
+                accepted += await insert_tasks(db, batch, owner_id, resync=False)
+                batch = []
+
+        if batch:
+            accepted += await insert_tasks(db, batch, owner_id, resync=False)
+    finally:
+        if accepted:
+            await publish_resync(owner_id)
+    return {"accepted": accepted, "rejected": rejected, "errors": errors}
@@ -1,10 +1,11 @@
 from pydantic import EmailStr
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.models import User
-from app.auth.hash import get_password_hash, verify_password
+from app.models.models import RefreshToken, User
+from app.auth.hash import get_password_hash_async, verify_password_async
+from app.auth.principal_cache import principal_cache
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
@@ -26,7 +27,8 @@ async def create_user(db: AsyncSession, email: str, plain_password: str) -> User
         raise HTTPException(
             status_code=409, detail="Account with this email already exists"
         )
-    new_user = User(email=email, hashed_password=get_password_hash(plain_password))
+    hashed_password = await get_password_hash_async(plain_password)
+    new_user = User(email=email, hashed_password=hashed_password)
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
@@ -40,6 +42,7 @@ async def update_user_email(db: AsyncSession, user: User, new_email: EmailStr) -
         raise HTTPException(status_code=400, detail="Email already registered")
     user.email = new_email
     await db.commit()
+    principal_cache.invalidate(user.id)
     await db.refresh(user)
     return user
 
@@ -47,10 +50,21 @@ async def update_user_email(db: AsyncSession, user: User, new_email: EmailStr) -
 async def update_user_password(
     db: AsyncSession, user: User, old_password: str, new_password: str
 ) -> User:
-    """Update an existing user's password."""
-    if not verify_password(old_password, user.hashed_password):
+    """Update an existing user's password and end all of their sessions."""
+    if not await verify_password_async(old_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect password")
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
+    await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user.id))
     await db.commit()
+    principal_cache.invalidate(user.id)
     await db.refresh(user)
     return user
+
+
+async def rehash_user_password(
+    db: AsyncSession, user: User, hashed_password: str
+) -> None:
+    """Replace an outdated password hash computed at login."""
+    user.hashed_password = hashed_password
+    await db.commit()
+    principal_cache.invalidate(user.id)
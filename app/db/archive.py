@@ -0,0 +1,122 @@
+"""Cold archival of completed tasks.
+
+Completed tasks not updated for ``TASK_ARCHIVE_AFTER_DAYS`` are moved from
+``tasks`` to ``tasks_archive`` in batches of ``TASK_ARCHIVE_BATCH_SIZE``, each
+in its own short transaction, so the working set behind the hot queries and
+indexes stops growing with history. Run ``python -m app.db.archive run`` from
+a scheduler, or set ``TASK_ARCHIVE_INTERVAL_SECONDS`` to run it in the server.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, insert, literal, literal_column, select
+from sqlalchemy.sql import Insert
+
+from app.models.models import Task, TaskArchive, utc_now
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TASK_ARCHIVE_AFTER_DAYS = float(os.getenv("TASK_ARCHIVE_AFTER_DAYS", "90"))
+TASK_ARCHIVE_BATCH_SIZE = int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", "1000"))
+# 0 leaves archival to the command line; otherwise each server process runs
+# it this often.
+TASK_ARCHIVE_INTERVAL_SECONDS = float(os.getenv("TASK_ARCHIVE_INTERVAL_SECONDS", "0"))
+
+TASK_COLUMNS = [column.name for column in Task.__table__.columns]
+
+# Spelled out instead of bound so the planner can use the partial index on
+# completed tasks.
+_IS_DONE = Task.status == literal_column("'DONE'")
+
+
+def archive_cutoff() -> datetime:
+    """Completed tasks last updated before this are due for archival."""
+    return utc_now() - timedelta(days=TASK_ARCHIVE_AFTER_DAYS)
+
+
+def copy_tasks(source, target, *where, **values) -> Insert:
+    """``INSERT INTO target SELECT ... FROM source`` for the rows matching
+    ``where``, keeping every task column and adding constant ``values``."""
+    columns = [getattr(source, name) for name in TASK_COLUMNS]
+    columns += [literal(value).label(name) for name, value in values.items()]
+    return insert(target).from_select(
+        TASK_COLUMNS + list(values), select(*columns).where(*where)
+    )
+
+
+async def archive_batch(connection, cutoff: datetime, batch_size: int) -> int:
+    """Move one batch of old completed tasks and return how many moved.
+
+    Runs inside the caller's transaction. On PostgreSQL the batch is locked
+    with ``SKIP LOCKED``, so tasks being edited right now wait for the next
+    run and concurrent archivers split the work instead of blocking.
+    """
+    candidates = (
+        select(Task.id)
+        .where(_IS_DONE, Task.updated_at < cutoff)
+        .order_by(Task.updated_at, Task.id)
+        .limit(batch_size)
+    )
+    if connection.dialect.name == "postgresql":
+        candidates = candidates.with_for_update(skip_locked=True)
+    task_ids = (await connection.execute(candidates)).scalars().all()
+    if not task_ids:
+        return 0
+    await connection.execute(
+        copy_tasks(Task, TaskArchive, Task.id.in_(task_ids), archived_at=utc_now())
+    )
+    await connection.execute(delete(Task).where(Task.id.in_(task_ids)))
+    return len(task_ids)
+
+
+async def archive_tasks(
+    batch_size: int = TASK_ARCHIVE_BATCH_SIZE, max_batches: Optional[int] = None
+) -> int:
+    """Archive every eligible task, committing batch by batch; return how many.
+
+    The cutoff is fixed when the run starts, so a run always terminates.
+    """
+    from app.db.database import async_engine
+
+    cutoff = archive_cutoff()
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        async with async_engine.begin() as connection:
+            count = await archive_batch(connection, cutoff, batch_size)
+        archived += count
+        batches += 1
+        if count < batch_size:
+            break
+    return archived
+
+
+async def archive_periodically(interval: float) -> None:
+    """Run :func:`archive_tasks` every ``interval`` seconds until cancelled."""
+    while True:
+        try:
+            archived = await archive_tasks()
+            if archived:
+                logger.info("Archived %d completed tasks", archived)
+        except Exception:
+            logger.warning("Task archival failed", exc_info=True)
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from app.db.database import run_cli
+
+    parser = argparse.ArgumentParser(description="Archive old completed tasks.")
+    parser.add_argument("command", choices=["run"])
+    parser.add_argument("--batch-size", type=int, default=TASK_ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+    archived = run_cli(archive_tasks(args.batch_size, args.max_batches))
+    print(f"Archived {archived} tasks")
@@ -0,0 +1,59 @@
+"""Change feed settings and tombstone compaction.
+
+Run ``python -m app.db.change_feed compact`` periodically to drop tombstones
+older than ``TOMBSTONE_RETENTION_DAYS``.
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from sqlalchemy import delete
+
+from app.models.models import TaskTombstone, utc_now
+
+load_dotenv()
+
+TOMBSTONE_RETENTION_DAYS = float(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+# Changes younger than this are held back: a transaction that stamped an
+# earlier updated_at may still be committing, and a client cursor must never
+# move past it.
+CHANGE_FEED_SETTLE_SECONDS = float(os.getenv("CHANGE_FEED_SETTLE_SECONDS", "1"))
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (as SQLite returns them) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def retention_horizon() -> datetime:
+    """Oldest point a change cursor may reference and still see every delete."""
+    return utc_now() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+
+def settled_before() -> datetime:
+    """Upper bound on the change timestamps the feed may return now."""
+    return utc_now() - timedelta(seconds=CHANGE_FEED_SETTLE_SECONDS)
+
+
+async def compact_tombstones() -> int:
+    """Delete tombstones past the retention horizon; return how many."""
+    from app.db.database import async_engine
+
+    async with async_engine.begin() as connection:
+        result = await connection.execute(
+            delete(TaskTombstone).where(TaskTombstone.deleted_at < retention_horizon())
+        )
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from app.db.database import run_cli
+
+    parser = argparse.ArgumentParser(description="Maintain the task change feed.")
+    parser.add_argument("command", choices=["compact"])
+    parser.parse_args()
+    print(f"Removed {run_cli(compact_tombstones())} tombstones")
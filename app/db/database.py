@@ -1,23 +1,50 @@
-from os import getenv
+import asyncio
+from typing import Awaitable, TypeVar
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv, find_dotenv
 
+from app.db.pool import TimedQueuePool
+from app.db.settings import DatabaseSettings
+
 load_dotenv(find_dotenv())
 
-ENV = getenv("ENV", "local")
-if ENV == "docker":
-    DATABASE_URL = getenv("DATABASE_URL_DOCKER")
-else:
-    DATABASE_URL = getenv("DATABASE_URL_LOCAL")
+settings = DatabaseSettings.from_env()
+DATABASE_URL = settings.url
+
+
+def create_engine_from_settings(db_settings: DatabaseSettings):
+    """Create an async engine configured from ``db_settings``."""
+    kwargs = db_settings.engine_kwargs()
+    if db_settings.uses_queue_pool:
+        kwargs["poolclass"] = TimedQueuePool
+    return create_async_engine(db_settings.url, **kwargs)
 
-async_engine = create_async_engine(DATABASE_URL, echo=True)
+
+async_engine = create_engine_from_settings(settings)
 async_session = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
+T = TypeVar("T")
+
 
 async def get_db() -> AsyncSession:
     """Yield a database session and ensure it closes after use."""
     async with async_session() as session:
         yield session
+
+
+def run_cli(command: Awaitable[T]) -> T:
+    """Run a command-line coroutine, then dispose of the engine.
+
+    Pooled connections would otherwise keep the process alive.
+    """
+
+    async def run() -> T:
+        try:
+            return await command
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
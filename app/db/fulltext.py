@@ -0,0 +1,202 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import Subquery
+
+# PostgreSQL: a generated tsvector column (title weighted above description)
+# with a GIN index for ranked search, plus trigram indexes so the legacy
+# substring filters on title/description can use an index too.
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+"""
+
+POSTGRES_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED
+    """,
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+    "CREATE INDEX ix_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)",
+    "CREATE INDEX ix_tasks_description_trgm "
+    "ON tasks USING gin (description gin_trgm_ops)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_tasks_description_trgm",
+    "DROP INDEX IF EXISTS ix_tasks_title_trgm",
+    "DROP INDEX IF EXISTS ix_tasks_search_vector",
+    "ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS tasks_fts_au",
+    "DROP TRIGGER IF EXISTS tasks_fts_ad",
+    "DROP TRIGGER IF EXISTS tasks_fts_ai",
+    "DROP TABLE IF EXISTS tasks_fts",
+]
+
+
+# The archive gets the same ranked search, without the trigram indexes: its
+# substring filters only ever scan one user's archived tasks.
+POSTGRES_ARCHIVE_UPGRADE = [
+    f"""
+    ALTER TABLE tasks_archive ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED
+    """,
+    "CREATE INDEX ix_tasks_archive_search_vector "
+    "ON tasks_archive USING gin (search_vector)",
+]
+
+POSTGRES_ARCHIVE_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_tasks_archive_search_vector",
+    "ALTER TABLE tasks_archive DROP COLUMN IF EXISTS search_vector",
+]
+
+# Archived rows are never updated, so inserts and deletes are all to mirror.
+SQLITE_ARCHIVE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_archive_fts USING fts5(
+        title, description, content='tasks_archive', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_ai
+    AFTER INSERT ON tasks_archive BEGIN
+        INSERT INTO tasks_archive_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_ad
+    AFTER DELETE ON tasks_archive BEGIN
+        INSERT INTO tasks_archive_fts(tasks_archive_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    "INSERT INTO tasks_archive_fts(tasks_archive_fts) VALUES ('rebuild')",
+]
+
+SQLITE_ARCHIVE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS tasks_archive_fts_ad",
+    "DROP TRIGGER IF EXISTS tasks_archive_fts_ai",
+    "DROP TABLE IF EXISTS tasks_archive_fts",
+]
+
+
+def upgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that installs full-text search for a dialect."""
+    if dialect_name == "postgresql":
+        return POSTGRES_UPGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_UPGRADE
+    return []
+
+
+def downgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that removes full-text search for a dialect."""
+    if dialect_name == "postgresql":
+        return POSTGRES_DOWNGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_DOWNGRADE
+    return []
+
+
+def archive_upgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that installs full-text search on ``tasks_archive``."""
+    if dialect_name == "postgresql":
+        return POSTGRES_ARCHIVE_UPGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_ARCHIVE_UPGRADE
+    return []
+
+
+def archive_downgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that removes full-text search from ``tasks_archive``."""
+    if dialect_name == "postgresql":
+        return POSTGRES_ARCHIVE_DOWNGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_ARCHIVE_DOWNGRADE
+    return []
+
+
+def install_search(connection) -> None:
+    """Create the search structures on a synchronous connection.
+
+    Intended for databases built with ``Base.metadata.create_all`` (local
+    SQLite files, benchmarks) rather than through Alembic.
+    """
+    for statements in (upgrade_statements, archive_upgrade_statements):
+        for statement in statements(connection.dialect.name):
+            connection.execute(text(statement))
+
+
+def _fts5_query(q: str) -> str:
+    """Quote every term so user input is never parsed as FTS5 syntax."""
+    terms = ['"' + term.replace('"', '""') + '"' for term in q.split()]
+    return " ".join(terms)
+
+
+def ranked_match(
+    dialect_name: str, q: str, table: str = "tasks"
+) -> Optional[Tuple[ColumnElement, Optional[ColumnElement], Optional[Subquery]]]:
+    """Return ``(score, where, join)`` for a full-text query on this dialect.
+
+    Higher scores rank first. ``where`` is applied to the query on ``table``
+    (``tasks`` or ``tasks_archive``) and ``join`` is a subquery to join on
+    ``task_id``. Returns ``None`` when the dialect has no full-text support or
+    the query has no terms.
+    """
+    if not q.split():
+        return None
+    if dialect_name == "postgresql":
+        vector = literal_column(f"{table}.search_vector")
+        tsquery = func.websearch_to_tsquery("simple", q)
+        return func.ts_rank_cd(vector, tsquery), vector.op("@@")(tsquery), None
+    if dialect_name == "sqlite":
+        fts_table = f"{table}_fts"
+        fts = literal_column(fts_table)
+        matches = (
+            select(
+                literal_column(f"{fts_table}.rowid").label("task_id"),
+                (-func.bm25(fts)).label("score"),
+            )
+            .select_from(text(fts_table))
+            .where(fts.match(_fts5_query(q)))
+            .subquery("fts_matches")
+        )
+        return matches.c.score, None, matches
+    return None
+
@@ -0,0 +1,82 @@
+import time
+from threading import Lock
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolWaitStats:
+    """Running totals of how long checkouts waited for a pooled connection."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        """Add one checkout attempt that took ``seconds``."""
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> dict:
+        """Return the counters as a plain dict."""
+        with self._lock:
+            average = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.total_wait, 6),
+                "wait_seconds_avg": round(average, 6),
+                "wait_seconds_max": round(self.max_wait, 6),
+            }
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout takes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """Describe the engine's pool: sizing, current usage and checkout waits."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, TimedQueuePool):
+        status["waits"] = pool.wait_stats.snapshot()
+    return status
@@ -0,0 +1,180 @@
+import itertools
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.jwt_handler import get_current_user
+from app.db.database import async_session, create_engine_from_settings
+from app.db.settings import DatabaseSettings
+from app.models.models import User
+
+logger = logging.getLogger(__name__)
+
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "0"))
+READ_YOUR_WRITES_MAX_USERS = 100_000
+# "memory" pins a user to the primary only in the worker that took the write;
+# "redis" shares the window with every worker and instance.
+READ_YOUR_WRITES_BACKEND = os.getenv("READ_YOUR_WRITES_BACKEND", "memory")
+READ_YOUR_WRITES_REDIS_URL = os.getenv(
+    "READ_YOUR_WRITES_REDIS_URL", "redis://localhost:6379/0"
+)
+
+
+class ReplicaSet:
+    """Session factories for read replicas and the policy to pick one.
+
+    ``round_robin`` cycles through replicas; ``least_connections`` picks the
+    replica whose pool has the fewest connections checked out.
+    """
+
+    def __init__(self, urls: List[str], strategy: str = "round_robin"):
+        self.engines = [
+            create_engine_from_settings(DatabaseSettings.from_env(url=url))
+            for url in urls
+        ]
+        self.sessionmakers = [
+            sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self.strategy = strategy
+        self._cycle = itertools.cycle(range(len(self.engines)))
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def _checked_out(self, index: int) -> int:
+        checkedout = getattr(self.engines[index].pool, "checkedout", None)
+        return checkedout() if checkedout is not None else 0
+
+    def choose(self) -> sessionmaker:
+        """Return the session factory of the replica to use next."""
+        if self.strategy == "least_connections":
+            index = min(range(len(self.engines)), key=self._checked_out)
+        else:
+            index = next(self._cycle)
+        return self.sessionmakers[index]
+
+
+class RecentWriters:
+    """Users who wrote recently and must read from the primary for a while.
+
+    Held in process memory, so only reads served by the worker that took the
+    write are pinned; use :class:`RedisRecentWriters` with several workers.
+    """
+
+    def __init__(self, window: float, max_users: int):
+        self.window = window
+        self.max_users = max_users
+        self._until: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    async def mark(self, user_id: int) -> None:
+        """Pin ``user_id`` to the primary for the configured window."""
+        if self.window <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + self.window
+            self._until.move_to_end(user_id)
+            # Entries are kept in expiry order, so expired ones sit at the front.
+            while self._until and (
+                len(self._until) > self.max_users
+                or next(iter(self._until.values())) <= now
+            ):
+                self._until.popitem(last=False)
+
+    async def is_recent(self, user_id: int) -> bool:
+        """Whether ``user_id`` is still inside its read-your-writes window."""
+        if self.window <= 0:
+            return False
+        with self._lock:
+            until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+class RedisRecentWriters:
+    """Read-your-writes windows shared by all workers through Redis.
+
+    Each write sets a key that expires with the window, so a read costs one
+    EXISTS. When Redis cannot be reached, reads go to the primary.
+    """
+
+    def __init__(self, client, window: float, prefix: str = "recentwrite"):
+        self.client = client
+        self.window = window
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, window: float) -> "RedisRecentWriters":
+        """Connect with redis-py, which is only needed for this backend."""
+        import redis.asyncio
+
+        return cls(redis.asyncio.from_url(url), window)
+
+    async def mark(self, user_id: int) -> None:
+        if self.window <= 0:
+            return
+        try:
+            await self.client.set(
+                f"{self.prefix}:{user_id}", 1, px=max(int(self.window * 1000), 1)
+            )
+        except Exception:
+            logger.warning("Recording a recent write failed", exc_info=True)
+
+    async def is_recent(self, user_id: int) -> bool:
+        if self.window <= 0:
+            return False
+        try:
+            return bool(await self.client.exists(f"{self.prefix}:{user_id}"))
+        except Exception:
+            logger.warning("Read-your-writes lookup failed", exc_info=True)
+            return True
+
+
+def _recent_writers_from_env():
+    if READ_YOUR_WRITES_BACKEND == "redis":
+        return RedisRecentWriters.from_url(
+            READ_YOUR_WRITES_REDIS_URL, READ_YOUR_WRITES_SECONDS
+        )
+    return RecentWriters(READ_YOUR_WRITES_SECONDS, READ_YOUR_WRITES_MAX_USERS)
+
+
+replicas = ReplicaSet(DATABASE_REPLICA_URLS, DB_REPLICA_STRATEGY)
+recent_writers = _recent_writers_from_env()
+
+
+async def mark_write(user_id: int) -> None:
+    """Record that ``user_id`` just changed data on the primary."""
+    if replicas:
+        await recent_writers.mark(user_id)
+
+
+async def read_sessionmaker(user_id: Optional[int] = None) -> sessionmaker:
+    """Pick the session factory for a read: a replica, or the primary when
+    none are configured or the user is inside the read-your-writes window."""
+    if not replicas or (
+        user_id is not None and await recent_writers.is_recent(user_id)
+    ):
+        return async_session
+    return replicas.choose()
+
+
+async def get_read_db(
+    current_user: User = Depends(get_current_user),
+) -> AsyncSession:
+    """Yield a read-only session for the current user and close it after use."""
+    async with (await read_sessionmaker(current_user.id))() as session:
+        yield session
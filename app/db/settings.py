@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from os import getenv
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable ("1", "true", "yes", "on")."""
+    value = getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """Engine and connection pool configuration read from the environment."""
+
+    url: str
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    query_cache_size: int = 500
+    prepared_statement_cache_size: int = 100
+
+    @classmethod
+    def from_env(cls, url: Optional[str] = None) -> "DatabaseSettings":
+        """Build settings from ``DB_*`` variables, falling back to defaults."""
+        if url is None:
+            if getenv("ENV", "local") == "docker":
+                url = getenv("DATABASE_URL_DOCKER")
+            else:
+                url = getenv("DATABASE_URL_LOCAL")
+        return cls(
+            url=url,
+            echo=_env_bool("DB_ECHO", cls.echo),
+            pool_size=int(getenv("DB_POOL_SIZE", cls.pool_size)),
+            max_overflow=int(getenv("DB_MAX_OVERFLOW", cls.max_overflow)),
+            pool_timeout=float(getenv("DB_POOL_TIMEOUT", cls.pool_timeout)),
+            pool_recycle=int(getenv("DB_POOL_RECYCLE", cls.pool_recycle)),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.pool_pre_ping),
+            query_cache_size=int(getenv("DB_QUERY_CACHE_SIZE", cls.query_cache_size)),
+            prepared_statement_cache_size=int(
+                getenv(
+                    "DB_PREPARED_STATEMENT_CACHE_SIZE",
+                    cls.prepared_statement_cache_size,
+                )
+            ),
+        )
+
+    @property
+    def uses_queue_pool(self) -> bool:
+        """Whether the URL supports a sized pool (in-memory SQLite does not)."""
+        url = make_url(self.url)
+        if url.get_backend_name() != "sqlite":
+            return True
+        return url.database not in (None, "", ":memory:")
+
+    def engine_kwargs(self) -> dict:
+        """Keyword arguments for ``create_async_engine``."""
+        kwargs = {
+            "echo": self.echo,
+            "pool_pre_ping": self.pool_pre_ping,
+            "query_cache_size": self.query_cache_size,
+        }
+        if self.uses_queue_pool:
+            kwargs.update(
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_recycle=self.pool_recycle,
+            )
+        if make_url(self.url).get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = {
+                "prepared_statement_cache_size": self.prepared_statement_cache_size
+            }
+        return kwargs
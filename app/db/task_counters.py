@@ -0,0 +1,256 @@
+"""Trigger-maintained task counters and the command that rebuilds them.
+
+Triggers on ``tasks`` keep ``task_counters`` in step with every INSERT, UPDATE
+and DELETE inside the writing transaction, whichever code path issued it.
+Triggers on ``tasks_archive`` count archived tasks too, so moving a task
+between the two tables leaves the counters unchanged.
+Run ``python -m app.db.task_counters rebuild [--user-id ID]`` to repair drift.
+"""
+
+import argparse
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+
+DIMENSIONS = ("status", "priority")
+COUNTED_TABLES = ("tasks", "tasks_archive")
+
+
+def _delta_rows(source: str, sign: int) -> List[str]:
+    return [
+        f"SELECT owner_id, '{dimension}' AS dimension, {dimension}::text AS value, "
+        f"{sign} AS delta FROM {source}"
+        for dimension in DIMENSIONS
+    ]
+
+
+def _postgres_function(name: str, sources: List[tuple]) -> str:
+    parts = [row for source, sign in sources for row in _delta_rows(source, sign)]
+    union = "\n            UNION ALL ".join(parts)
+    return f"""
+    CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO task_counters (owner_id, dimension, value, count)
+        SELECT owner_id, dimension, value, sum(delta)
+        FROM (
+            {union}
+        ) AS deltas
+        GROUP BY owner_id, dimension, value
+        HAVING sum(delta) <> 0
+        ON CONFLICT (owner_id, dimension, value)
+        DO UPDATE SET count = task_counters.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """
+
+
+# PostgreSQL: statement-level triggers aggregate each statement's transition
+# tables, so a 1,000-row bulk insert costs one counter upsert per key.
+POSTGRES_UPGRADE = [
+    _postgres_function("task_counters_on_insert", [("new_rows", 1)]),
+    _postgres_function("task_counters_on_update", [("old_rows", -1), ("new_rows", 1)]),
+    _postgres_function("task_counters_on_delete", [("old_rows", -1)]),
+    """
+    CREATE TRIGGER task_counters_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_insert()
+    """,
+    """
+    CREATE TRIGGER task_counters_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_update()
+    """,
+    """
+    CREATE TRIGGER task_counters_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_delete()
+    """,
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS task_counters_delete ON tasks",
+    "DROP TRIGGER IF EXISTS task_counters_update ON tasks",
+    "DROP TRIGGER IF EXISTS task_counters_insert ON tasks",
+    "DROP FUNCTION IF EXISTS task_counters_on_delete()",
+    "DROP FUNCTION IF EXISTS task_counters_on_update()",
+    "DROP FUNCTION IF EXISTS task_counters_on_insert()",
+]
+
+
+# Archived rows are never updated, so only inserts and deletes are counted;
+# the functions above are shared since they only read the transition tables.
+POSTGRES_ARCHIVE_UPGRADE = [
+    """
+    CREATE TRIGGER task_counters_archive_insert AFTER INSERT ON tasks_archive
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_insert()
+    """,
+    """
+    CREATE TRIGGER task_counters_archive_delete AFTER DELETE ON tasks_archive
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_delete()
+    """,
+]
+
+POSTGRES_ARCHIVE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS task_counters_archive_delete ON tasks_archive",
+    "DROP TRIGGER IF EXISTS task_counters_archive_insert ON tasks_archive",
+]
+
+
+def _sqlite_upserts(row: str, sign: int) -> str:
+    return "\n".join(
+        f"""
+        INSERT INTO task_counters (owner_id, dimension, value, count)
+        VALUES ({row}.owner_id, '{dimension}', {row}.{dimension}, {sign})
+        ON CONFLICT (owner_id, dimension, value)
+        DO UPDATE SET count = count + ({sign});"""
+        for dimension in DIMENSIONS
+    )
+
+
+# SQLite: row-level triggers; updates that leave status, priority and owner
+# untouched do not fire at all.
+SQLITE_UPGRADE = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_ai AFTER INSERT ON tasks BEGIN
+        {_sqlite_upserts("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_au
+    AFTER UPDATE OF status, priority, owner_id ON tasks BEGIN
+        {_sqlite_upserts("old", -1)}
+        {_sqlite_upserts("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_ad AFTER DELETE ON tasks BEGIN
+        {_sqlite_upserts("old", -1)}
+    END
+    """,
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS task_counters_ad",
+    "DROP TRIGGER IF EXISTS task_counters_au",
+    "DROP TRIGGER IF EXISTS task_counters_ai",
+]
+
+
+SQLITE_ARCHIVE_UPGRADE = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_archive_ai
+    AFTER INSERT ON tasks_archive BEGIN
+        {_sqlite_upserts("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_archive_ad
+    AFTER DELETE ON tasks_archive BEGIN
+        {_sqlite_upserts("old", -1)}
+    END
+    """,
+]
+
+SQLITE_ARCHIVE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS task_counters_archive_ad",
+    "DROP TRIGGER IF EXISTS task_counters_archive_ai",
+]
+
+
+def upgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that installs the counter triggers for a dialect."""
+    if dialect_name == "postgresql":
+        return POSTGRES_UPGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_UPGRADE
+    return []
+
+
+def downgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that removes the counter triggers for a dialect."""
+    if dialect_name == "postgresql":
+        return POSTGRES_DOWNGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_DOWNGRADE
+    return []
+
+
+def archive_upgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that installs the counter triggers on ``tasks_archive``."""
+    if dialect_name == "postgresql":
+        return POSTGRES_ARCHIVE_UPGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_ARCHIVE_UPGRADE
+    return []
+
+
+def archive_downgrade_statements(dialect_name: str) -> List[str]:
+    """Return the DDL that removes the counter triggers from ``tasks_archive``."""
+    if dialect_name == "postgresql":
+        return POSTGRES_ARCHIVE_DOWNGRADE
+    if dialect_name == "sqlite":
+        return SQLITE_ARCHIVE_DOWNGRADE
+    return []
+
+
+def install_counters(connection) -> None:
+    """Create the counter triggers on a synchronous connection.
+
+    Intended for databases built with ``Base.metadata.create_all``.
+    """
+    for statements in (upgrade_statements, archive_upgrade_statements):
+        for statement in statements(connection.dialect.name):
+            connection.execute(text(statement))
+
+
+def rebuild_statements(
+    dialect_name: str,
+    user_id: Optional[int] = None,
+    tables: Sequence[str] = COUNTED_TABLES,
+) -> List:
+    """Return statements that recompute counters from ``tables``."""
+    cast = "::text" if dialect_name == "postgresql" else ""
+    scope = "WHERE owner_id = :user_id" if user_id is not None else ""
+    rows = " UNION ALL ".join(
+        f"SELECT owner_id, status, priority FROM {table}" for table in tables
+    )
+    selects = " UNION ALL ".join(
+        f"SELECT owner_id, '{dimension}', {dimension}{cast}, count(*) "
+        f"FROM ({rows}) AS counted {scope} GROUP BY owner_id, {dimension}"
+        for dimension in DIMENSIONS
+    )
+    params = {"user_id": user_id} if user_id is not None else {}
+    statements = []
+    if dialect_name == "postgresql":
+        # Block writers for the duration so no delta is lost between steps.
+        statements.append(text(f"LOCK TABLE {', '.join(tables)} IN SHARE MODE"))
+    statements += [
+        text(f"DELETE FROM task_counters {scope}").bindparams(**params),
+        text(
+            "INSERT INTO task_counters (owner_id, dimension, value, count) "
+            + selects
+        ).bindparams(**params),
+    ]
+    return statements
+
+
+async def rebuild_counters(user_id: Optional[int] = None) -> None:
+    """Recompute counters for one user, or everyone, in a single transaction."""
+    from app.db.database import async_engine
+
+    async with async_engine.begin() as connection:
+        for statement in rebuild_statements(connection.dialect.name, user_id):
+            await connection.execute(statement)
+
+
+if __name__ == "__main__":
+    from app.db.database import run_cli
+
+    parser = argparse.ArgumentParser(description="Maintain task counters.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    run_cli(rebuild_counters(args.user_id))
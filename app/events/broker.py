@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+RESYNC = {"op": "resync"}
+
+
+class Subscription:
+    """Bounded, coalescing inbox of one subscriber.
+
+    Pending events are keyed by task, so a burst of updates to the same task
+    collapses into the latest one. When more than ``max_pending`` distinct
+    events pile up the backlog is dropped and replaced by a single ``resync``
+    event, telling the client to catch up through the change feed.
+    """
+
+    def __init__(self, user_id: int, max_pending: int):
+        self.user_id = user_id
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: OrderedDict = OrderedDict()
+        self._overflowed = False
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict) -> None:
+        """Queue an event without ever blocking the publisher."""
+        if not self._overflowed:
+            key = event.get("id", event["op"])
+            self._pending.pop(key, None)
+            self._pending[key] = event
+            if len(self._pending) > self.max_pending:
+                self.dropped += len(self._pending)
+                self._pending.clear()
+                self._overflowed = True
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> List[dict]:
+        """Wait up to ``timeout`` seconds and return every pending event."""
+        if not self._ready.is_set():
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        if self._overflowed:
+            self._overflowed = False
+            return [RESYNC]
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class MemoryBroker:
+    """Fans events out to the subscribers of this process only."""
+
+    def __init__(self, max_pending: int = 256):
+        self.max_pending = max_pending
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self.published = 0
+
+    async def subscribe(self, user_id: int) -> Subscription:
+        """Register a new subscription to ``user_id``'s events."""
+        subscription = Subscription(user_id, self.max_pending)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription; safe to call more than once."""
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.user_id]
+
+    def deliver(self, user_id: int, events: List[dict]) -> None:
+        """Hand events to every local subscriber of ``user_id``."""
+        for subscription in self._subscribers.get(user_id, ()):
+            for event in events:
+                subscription.push(event)
+
+    def deliver_all(self, event: dict) -> None:
+        """Hand one event to every local subscriber."""
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.push(event)
+
+    async def publish(self, user_id: int, events: List[dict]) -> None:
+        """Publish events about ``user_id``'s tasks."""
+        self.published += len(events)
+        self.deliver(user_id, events)
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+    def stats(self) -> dict:
+        """Return subscriber and delivery counters."""
+        subscriptions = [s for subs in self._subscribers.values() for s in subs]
+        return {
+            "backend": type(self).__name__,
+            "users": len(self._subscribers),
+            "subscriptions": len(subscriptions),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in subscriptions),
+        }
+
+
+class PostgresBroker(MemoryBroker):
+    """Broadcasts events to every worker through PostgreSQL LISTEN/NOTIFY.
+
+    Each worker holds one listening connection and delivers notifications to
+    its own subscribers, and one connection for publishing. Both are opened
+    lazily with asyncpg. If the listener drops it is reopened in the
+    background and every subscriber is told to resync, since notifications
+    sent in the meantime are lost.
+    """
+
+    RECONNECT_DELAY = 1.0
+    MAX_RECONNECT_DELAY = 30.0
+
+    def __init__(self, dsn: str, channel: str = "task_events", max_pending: int = 256):
+        super().__init__(max_pending)
+        self.dsn = dsn
+        self.channel = channel
+        self._listener = None
+        self._publisher = None
+        self._lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def _connect(self):
+        import asyncpg
+
+        return await asyncpg.connect(self.dsn)
+
+    async def _ensure_listener(self) -> None:
+        async with self._lock:
+            if self._listener is not None and not self._listener.is_closed():
+                return
+            listener = await self._connect()
+            await listener.add_listener(self.channel, self._on_notify)
+            listener.add_termination_listener(self._on_listener_lost)
+            self._listener = listener
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+            self.deliver(message["u"], [message["e"]])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed task event %r", payload)
+
+    def _on_listener_lost(self, connection) -> None:
+        self._listener = None
+        if not self._closed and self._subscribers and self._reconnect_task is None:
+            self._reconnect_task = asyncio.get_running_loop().create_task(
+                self._reconnect()
+            )
+
+    async def _reconnect(self) -> None:
+        delay = self.RECONNECT_DELAY
+        try:
+            while self._subscribers:
+                try:
+                    await self._ensure_listener()
+                except Exception:
+                    logger.warning("Task event listener reconnect failed")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+                    continue
+                self.deliver_all(RESYNC)
+                return
+        finally:
+            self._reconnect_task = None
+
+    async def subscribe(self, user_id: int) -> Subscription:
+        await self._ensure_listener()
+        return await super().subscribe(user_id)
+
+    async def publish(self, user_id: int, events: List[dict]) -> None:
+        """Send events with one ``pg_notify`` round trip.
+
+        Failures are logged, not raised: the write has already committed and
+        clients recover through the change feed.
+        """
+        payloads = [
+            json.dumps({"u": user_id, "e": event}, separators=(",", ":"))
+            for event in events
+        ]
+        try:
+            async with self._lock:
+                if self._publisher is None or self._publisher.is_closed():
+                    self._publisher = await self._connect()
+                await self._publisher.execute(
+                    "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload",
+                    self.channel,
+                    payloads,
+                )
+        except Exception:
+            logger.warning("Publishing task events failed", exc_info=True)
+            return
+        self.published += len(events)
+
+    async def close(self) -> None:
+        self._closed = True
+        async with self._lock:
+            for connection in (self._listener, self._publisher):
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            self._listener = self._publisher = None
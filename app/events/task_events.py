@@ -0,0 +1,57 @@
+import os
+from typing import Iterable, List
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+
+from app.db.database import DATABASE_URL
+from app.events.broker import RESYNC, MemoryBroker, PostgresBroker
+from app.schemas.task import TaskResponse
+
+load_dotenv()
+
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "task_events")
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
+def _asyncpg_dsn(url: str) -> str:
+    """Turn a SQLAlchemy URL into a DSN asyncpg accepts."""
+    return (
+        make_url(url)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+
+
+def upsert_events(tasks: Iterable) -> List[dict]:
+    """Build events for created or updated tasks."""
+    return [
+        {
+            "op": "upsert",
+            "id": task.id,
+            "task": TaskResponse.model_validate(task).model_dump(mode="json"),
+        }
+        for task in tasks
+    ]
+
+
+def delete_events(task_ids: Iterable[int]) -> List[dict]:
+    """Build events for deleted tasks."""
+    return [{"op": "delete", "id": task_id} for task_id in task_ids]
+
+
+def resync_events() -> List[dict]:
+    """Build the event telling clients to catch up through the change feed."""
+    return [RESYNC]
+
+
+def _broker_from_env():
+    if EVENTS_BACKEND == "postgres":
+        url = os.getenv("EVENTS_DATABASE_URL") or DATABASE_URL
+        return PostgresBroker(_asyncpg_dsn(url), EVENTS_CHANNEL, EVENTS_QUEUE_SIZE)
+    return MemoryBroker(EVENTS_QUEUE_SIZE)
+
+
+task_events = _broker_from_env()
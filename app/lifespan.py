@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.hash import HASH_MAX_WORKERS, get_password_hash_async, shutdown_hash_pool
+from app.crud.task_crud import (
+    delete_task,
+    get_task_collection_version,
+    get_task_row_by_id,
+    get_task_rows_by_user,
+    update_task,
+)
+from app.crud.user_crud import get_user_by_email, get_user_by_id
+from app.db.archive import TASK_ARCHIVE_INTERVAL_SECONDS, archive_periodically
+from app.db.database import async_engine, async_session, settings
+from app.db.replicas import replicas
+from app.events.task_events import task_events
+from app.scheduler.deadlines import DEADLINE_SCHEDULER, deadline_scheduler
+from app.schemas.task import TaskUpdate
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+WARMUP = os.getenv("WARMUP", "true").lower() in {"1", "true", "yes", "on"}
+WARMUP_DB_CONNECTIONS = int(os.getenv("WARMUP_DB_CONNECTIONS", str(settings.pool_size)))
+
+# No row has ID 0, so every warm-up statement matches nothing.
+_MISSING_ID = 0
+
+
+async def _warm_connection(session_factory: sessionmaker, writes: bool) -> None:
+    """Run the hot statements once on one pooled connection, then roll back.
+
+    This compiles them into the engine's statement cache and, on asyncpg,
+    prepares them on the connection.
+    """
+    async with session_factory() as db:
+        await get_user_by_id(db, _MISSING_ID)
+        await get_user_by_email(db, "")
+        await get_task_collection_version(db, _MISSING_ID)
+        await get_task_rows_by_user(db, _MISSING_ID)
+        calls = [get_task_row_by_id(db, _MISSING_ID)]
+        if writes:
+            calls += [
+                update_task(db, _MISSING_ID, TaskUpdate(title="warmup"), _MISSING_ID),
+                delete_task(db, _MISSING_ID, _MISSING_ID),
+            ]
+        for call in calls:
+            try:
+                await call
+            except HTTPException:
+                pass
+        await db.rollback()
+
+
+async def warm_database() -> None:
+    """Open ``WARMUP_DB_CONNECTIONS`` connections per engine and warm each."""
+    targets = [(async_session, True)]
+    targets += [(factory, False) for factory in replicas.sessionmakers]
+    await asyncio.gather(
+        *(
+            _warm_connection(factory, writes)
+            for factory, writes in targets
+            for _ in range(max(WARMUP_DB_CONNECTIONS, 1))
+        )
+    )
+
+
+async def warm_password_hashing() -> None:
+    """Start every hashing pool worker and load the bcrypt backend in it."""
+    await asyncio.gather(
+        *(get_password_hash_async("warmup") for _ in range(HASH_MAX_WORKERS))
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm connections, statement caches and bcrypt before serving traffic,
+    start background jobs, and release everything on shutdown. Warm-up
+    failures are logged, not fatal."""
+    if WARMUP:
+        for step in (warm_database, warm_password_hashing):
+            try:
+                await step()
+            except Exception:
+                logger.warning("Warm-up step %s failed", step.__name__, exc_info=True)
+    jobs = []
+    if TASK_ARCHIVE_INTERVAL_SECONDS > 0:
+        jobs.append(
+            asyncio.create_task(archive_periodically(TASK_ARCHIVE_INTERVAL_SECONDS))
+        )
+    if DEADLINE_SCHEDULER:
+        await deadline_scheduler.start()
+    try:
+        yield
+    finally:
+        await deadline_scheduler.stop()
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        await task_events.close()
+        shutdown_hash_pool()
+        for engine in [async_engine, *replicas.engines]:
+            await engine.dispose()
@@ -1,16 +1,26 @@
 from fastapi import FastAPI
-import uvicorn
 
-from app.routers import auth, users, tasks
+from app.compression import CompressionMiddleware
+from app.db.database import async_engine
+from app.db.replicas import replicas
+from app.lifespan import lifespan
+from app.metrics.db import instrument_engine
+from app.metrics.middleware import MetricsMiddleware
+from app.ratelimit.admission import AdmissionMiddleware
+from app.routers import auth, users, tasks, internal, metrics
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+# Time every SQL statement on the primary and the read replicas
+for engine in [async_engine, *replicas.engines]:
+    instrument_engine(engine)
 
 # Register API routers
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(tasks.router)
-
-
-if __name__ == "__main__":
-    # Run the FastAPI app with auto-reload enabled
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+app.include_router(internal.router)
+app.include_router(metrics.router)
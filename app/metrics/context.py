@@ -0,0 +1,40 @@
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestStats:
+    """Database work attributed to the request (or capture) being handled.
+
+    Stats nest: a request started inside a :func:`count_queries` block keeps
+    the block's stats as ``parent``, and every statement is counted on the
+    whole chain. ``statement_counts`` tallies statements by SQL text and is
+    only kept when query budgets are enforced.
+    """
+
+    __slots__ = ("statements", "db_seconds", "statement_counts", "budget", "parent")
+
+    def __init__(
+        self, parent: Optional["RequestStats"] = None, track_statements: bool = False
+    ):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.statement_counts: Optional[dict] = {} if track_statements else None
+        self.budget: Optional[int] = None
+        self.parent = parent
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Count one executed statement on this stats object and its parents."""
+        stats = self
+        while stats is not None:
+            stats.statements += 1
+            stats.db_seconds += seconds
+            if stats.statement_counts is not None:
+                stats.statement_counts[statement] = (
+                    stats.statement_counts.get(statement, 0) + 1
+                )
+            stats = stats.parent
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
@@ -0,0 +1,37 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.metrics.context import current_request_stats
+from app.metrics.instruments import DB_STATEMENT_DURATION
+
+_START_KEY = "metrics_statement_start"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info[_START_KEY].pop()
+    DB_STATEMENT_DURATION.observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_KEY):
+        connection.info[_START_KEY].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement the engine executes and attribute it to the request."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,115 @@
+from collections import Counter as Tally
+
+from app.metrics.registry import REGISTRY, CallbackGauge, Counter, Histogram
+
+QUERY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55)
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by method, route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from receiving a request to sending the last body chunk.",
+        ("method", "route"),
+    )
+)
+# Scopes of requests being handled, keyed by id(). Their route is resolved at
+# scrape time, so the hot path only pays for a dict insert and delete.
+IN_FLIGHT_SCOPES: dict = {}
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_label(scope) -> str:
+    """Return the matched route's path template, which keeps cardinality low."""
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+def _in_flight() -> dict:
+    return Tally(
+        (scope["method"], route_label(scope))
+        for scope in list(IN_FLIGHT_SCOPES.values())
+    )
+
+
+HTTP_IN_FLIGHT = REGISTRY.register(
+    CallbackGauge(
+        "http_requests_in_flight",
+        "Requests currently being handled.",
+        ("method", "route"),
+        _in_flight,
+    )
+)
+DB_STATEMENT_DURATION = REGISTRY.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "Time spent executing individual SQL statements.",
+        buckets=QUERY_BUCKETS,
+    )
+)
+DB_STATEMENTS_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        "db_statements_per_request",
+        "SQL statements issued while handling one request.",
+        ("method", "route"),
+        buckets=STATEMENT_COUNT_BUCKETS,
+    )
+)
+DB_TIME_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        "db_time_per_request_seconds",
+        "Total SQL execution time while handling one request.",
+        ("method", "route"),
+        buckets=QUERY_BUCKETS,
+    )
+)
+AUTH_CURRENT_USER_DURATION = REGISTRY.register(
+    Histogram(
+        "auth_current_user_seconds",
+        "Time to resolve the authenticated user, by principal cache outcome.",
+        ("source",),
+        buckets=QUERY_BUCKETS,
+    )
+)
+PASSWORD_HASH_DURATION = REGISTRY.register(
+    Histogram(
+        "password_hash_seconds",
+        "Time to hash or verify a password, including waiting for the pool.",
+        ("operation",),
+    )
+)
+RATE_LIMITED = REGISTRY.register(
+    Counter(
+        "rate_limited_total",
+        "Requests rejected with 429 by rate limit budget.",
+        ("policy",),
+    )
+)
+ADMISSION_REJECTED = REGISTRY.register(
+    Counter(
+        "admission_rejected_total",
+        "Requests shed with 503 because too many were in flight.",
+    )
+)
+DEADLINE_REMINDERS = REGISTRY.register(
+    Counter(
+        "deadline_reminders_total",
+        "Due tasks handed to each deadline hook, by outcome.",
+        ("hook", "outcome"),
+    )
+)
+COMPRESSION_BYTES = REGISTRY.register(
+    Counter(
+        "http_response_compression_bytes_total",
+        "Response body bytes before and after compression, by encoding.",
+        ("encoding", "stage"),
+    )
+)
@@ -0,0 +1,67 @@
+import logging
+import time
+
+from app.metrics.context import RequestStats, current_request_stats
+from app.metrics.instruments import (
+    DB_STATEMENTS_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    IN_FLIGHT_SCOPES,
+    route_label,
+)
+from app.metrics.query_budget import QueryBudgetExceeded, enforce, tracking_enabled
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and DB work per route.
+
+    The router stores the matched route in the shared ``scope``, so labels are
+    read from it once the request is done instead of matching routes here.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestStats(current_request_stats.get(), tracking_enabled())
+        token = current_request_stats.set(stats)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        key = id(scope)
+        IN_FLIGHT_SCOPES[key] = scope
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            del IN_FLIGHT_SCOPES[key]
+            method, route = scope["method"], route_label(scope)
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            HTTP_REQUEST_DURATION.observe(elapsed, method, route)
+            DB_STATEMENTS_PER_REQUEST.observe(stats.statements, method, route)
+            DB_TIME_PER_REQUEST.observe(stats.db_seconds, method, route)
+            current_request_stats.reset(token)
+            if stats.budget is None:
+                # Budgeted endpoints were already checked by @query_budget.
+                _warn_only(stats, f"{method} {route}")
+
+
+def _warn_only(stats: RequestStats, where: str) -> None:
+    """Report N+1 patterns of unbudgeted requests without failing them."""
+    try:
+        enforce(stats, where)
+    except QueryBudgetExceeded as exc:
+        logger.warning(str(exc))
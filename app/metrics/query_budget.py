@@ -0,0 +1,109 @@
+import functools
+import logging
+import os
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+from app.metrics.context import RequestStats, current_request_stats
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "off" skips all checks, "warn" logs violations, "raise" fails the request;
+# use "raise" in tests and "warn" in staging.
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "off")
+# The same SQL run this many times in one request is reported as a likely N+1.
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request ran more SQL than its budget allows, or repeated a statement."""
+
+
+def tracking_enabled() -> bool:
+    """Whether statements should be tallied by text for budget checks."""
+    return QUERY_BUDGET_MODE != "off"
+
+
+def violations(stats: RequestStats) -> List[str]:
+    """Describe how ``stats`` breaks its budget or the N+1 threshold."""
+    problems = []
+    if stats.budget is not None and stats.statements > stats.budget:
+        problems.append(
+            f"{stats.statements} SQL statements exceed the budget of {stats.budget}"
+        )
+    for statement, count in (stats.statement_counts or {}).items():
+        if count >= N_PLUS_ONE_THRESHOLD:
+            snippet = " ".join(statement.split())[:200]
+            problems.append(f"possible N+1: {count} executions of {snippet!r}")
+    return problems
+
+
+def enforce(stats: Optional[RequestStats], where: str) -> None:
+    """Log or raise for any violation, according to ``QUERY_BUDGET_MODE``."""
+    if stats is None or not tracking_enabled():
+        return
+    problems = violations(stats)
+    if not problems:
+        return
+    message = f"{where}: " + "; ".join(problems)
+    if QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def query_budget(max_queries: int):
+    """Declare the most SQL statements an endpoint may issue per request.
+
+    The count includes dependencies such as ``get_current_user``. Apply it
+    below the route decorator::
+
+        @router.put("/{task_id}")
+        @query_budget(2)
+        async def update_task_handler(...): ...
+    """
+
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            stats = current_request_stats.get()
+            if stats is not None:
+                stats.budget = max_queries
+            result = await endpoint(*args, **kwargs)
+            enforce(stats, endpoint.__name__)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def count_queries() -> Iterator[RequestStats]:
+    """Count the SQL statements issued inside the block, including requests
+    served in-process (e.g. through ``httpx.ASGITransport``)::
+
+        with count_queries() as queries:
+            await client.put(f"/tasks/{task_id}", json=payload, headers=auth)
+        assert queries.statements <= 2
+    """
+    stats = RequestStats(parent=current_request_stats.get(), track_statements=True)
+    token = current_request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_request_stats.reset(token)
+
+
+@contextmanager
+def max_queries(limit: int) -> Iterator[RequestStats]:
+    """Like :func:`count_queries`, but raise if the block exceeds ``limit``."""
+    with count_queries() as stats:
+        yield stats
+    if stats.statements > limit:
+        raise QueryBudgetExceeded(
+            f"{stats.statements} SQL statements exceed the limit of {limit}"
+        )
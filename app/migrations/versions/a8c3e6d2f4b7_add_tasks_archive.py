@@ -0,0 +1,101 @@
+"""add tasks archive
+
+Revision ID: a8c3e6d2f4b7
+Revises: f5b1d7e3c9a4
+Create Date: 2026-10-18 16:41:09.318264
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db import fulltext, task_counters
+from app.models.enums import TaskPriority, TaskStatus
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8c3e6d2f4b7"
+down_revision: Union[str, Sequence[str], None] = "f5b1d7e3c9a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.String(length=1000), nullable=True),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "status",
+            # The types already exist; the generic Enum ignores create_type.
+            postgresql.ENUM(TaskStatus, name="taskstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "priority",
+            postgresql.ENUM(TaskPriority, name="taskpriority", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_tasks_archive_owner_created_at_id",
+        "tasks_archive",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_archive_owner_deadline_id",
+        "tasks_archive",
+        ["owner_id", "deadline", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_done_updated_at_id",
+        "tasks",
+        ["updated_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'DONE'"),
+        sqlite_where=sa.text("status = 'DONE'"),
+    )
+    dialect_name = op.get_bind().dialect.name
+    for statement in fulltext.archive_upgrade_statements(dialect_name):
+        op.execute(sa.text(statement))
+    for statement in task_counters.archive_upgrade_statements(dialect_name):
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Move archived tasks back first, while the archive's delete trigger still
+    # offsets the insert trigger on tasks in the counters.
+    op.execute(
+        "INSERT INTO tasks (id, title, description, deadline, status, priority, "
+        "owner_id, created_at, updated_at) "
+        "SELECT id, title, description, deadline, status, priority, "
+        "owner_id, created_at, updated_at FROM tasks_archive"
+    )
+    op.execute("DELETE FROM tasks_archive")
+    dialect_name = op.get_bind().dialect.name
+    for statement in task_counters.archive_downgrade_statements(dialect_name):
+        op.execute(sa.text(statement))
+    for statement in fulltext.archive_downgrade_statements(dialect_name):
+        op.execute(sa.text(statement))
+    op.drop_index("ix_tasks_done_updated_at_id", table_name="tasks")
+    op.drop_index("ix_tasks_archive_owner_deadline_id", table_name="tasks_archive")
+    op.drop_index("ix_tasks_archive_owner_created_at_id", table_name="tasks_archive")
+    op.drop_table("tasks_archive")
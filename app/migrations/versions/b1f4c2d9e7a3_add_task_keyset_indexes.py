@@ -0,0 +1,40 @@
+"""add task keyset pagination indexes
+
+Revision ID: b1f4c2d9e7a3
+Revises: aa0c0692e43c
+Create Date: 2026-10-18 10:12:41.503128
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b1f4c2d9e7a3"
+down_revision: Union[str, Sequence[str], None] = "aa0c0692e43c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_owner_created_at_id",
+        "tasks",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_owner_deadline_id",
+        "tasks",
+        ["owner_id", "deadline", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_deadline_id", table_name="tasks")
+    op.drop_index("ix_tasks_owner_created_at_id", table_name="tasks")
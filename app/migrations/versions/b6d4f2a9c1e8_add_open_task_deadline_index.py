@@ -0,0 +1,36 @@
+"""add open task deadline index
+
+Revision ID: b6d4f2a9c1e8
+Revises: a8c3e6d2f4b7
+Create Date: 2026-10-18 18:05:42.906117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d4f2a9c1e8"
+down_revision: Union[str, Sequence[str], None] = "a8c3e6d2f4b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_open_deadline_id",
+        "tasks",
+        ["deadline", "id"],
+        unique=False,
+        postgresql_where=sa.text("status != 'DONE'"),
+        sqlite_where=sa.text("status != 'DONE'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_open_deadline_id", table_name="tasks")
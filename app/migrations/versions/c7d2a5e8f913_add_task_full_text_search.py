@@ -0,0 +1,33 @@
+"""add task full-text search
+
+Revision ID: c7d2a5e8f913
+Revises: b1f4c2d9e7a3
+Create Date: 2026-10-18 11:03:17.284610
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.fulltext import downgrade_statements, upgrade_statements
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2a5e8f913"
+down_revision: Union[str, Sequence[str], None] = "b1f4c2d9e7a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in upgrade_statements(op.get_bind().dialect.name):
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in downgrade_statements(op.get_bind().dialect.name):
+        op.execute(sa.text(statement))
@@ -0,0 +1,33 @@
+"""add task updated_at index
+
+Revision ID: d4e8b3f1a6c2
+Revises: c7d2a5e8f913
+Create Date: 2026-10-18 13:26:05.917342
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e8b3f1a6c2"
+down_revision: Union[str, Sequence[str], None] = "c7d2a5e8f913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_owner_updated_at_id",
+        "tasks",
+        ["owner_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_updated_at_id", table_name="tasks")
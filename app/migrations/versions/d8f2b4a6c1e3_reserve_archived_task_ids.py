@@ -0,0 +1,72 @@
+"""reserve archived task ids
+
+Revision ID: d8f2b4a6c1e3
+Revises: c3e7a1f5d9b2
+Create Date: 2026-10-19 10:24:51.207336
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.models import Task, User
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8f2b4a6c1e3"
+down_revision: Union[str, Sequence[str], None] = "c3e7a1f5d9b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild_tasks(autoincrement: bool) -> None:
+    """Recreate ``tasks`` on SQLite with or without AUTOINCREMENT.
+
+    Indexes and triggers go with the old table, so their definitions are
+    read from the schema first and replayed on the new one.
+    """
+    bind = op.get_bind()
+    dependents = bind.execute(
+        sa.text(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'tasks' "
+            "AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        )
+    ).scalars()
+    dependents = list(dependents)
+    metadata = sa.MetaData()
+    # The foreign key needs its target in the same metadata.
+    User.__table__.to_metadata(metadata)
+    table = Task.__table__.to_metadata(metadata, name="tasks_rebuilt")
+    table.kwargs["sqlite_autoincrement"] = autoincrement
+    bind.execute(sa.schema.CreateTable(table))
+    columns = ", ".join(column.name for column in table.columns)
+    op.execute(f"INSERT INTO tasks_rebuilt ({columns}) SELECT {columns} FROM tasks")
+    op.execute("DROP TABLE tasks")
+    op.execute("ALTER TABLE tasks_rebuilt RENAME TO tasks")
+    for statement in dependents:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL sequences never reuse IDs; SQLite does without AUTOINCREMENT.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild_tasks(autoincrement=True)
+    # Start after every ID in use, including those of archived tasks; the
+    # copy above already left a row that only covers live ones.
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', max(id) FROM "
+        "(SELECT id FROM tasks UNION ALL SELECT id FROM tasks_archive) "
+        "HAVING max(id) IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild_tasks(autoincrement=False)
@@ -0,0 +1,53 @@
+"""add task counters
+
+Revision ID: e2a9c6f4b8d1
+Revises: d4e8b3f1a6c2
+Create Date: 2026-10-18 14:12:48.530271
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.task_counters import (
+    downgrade_statements,
+    rebuild_statements,
+    upgrade_statements,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a9c6f4b8d1"
+down_revision: Union[str, Sequence[str], None] = "d4e8b3f1a6c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_counters",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("dimension", sa.String(length=16), nullable=False),
+        sa.Column("value", sa.String(length=32), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("owner_id", "dimension", "value"),
+    )
+    dialect_name = op.get_bind().dialect.name
+    for statement in upgrade_statements(dialect_name):
+        op.execute(sa.text(statement))
+    for statement in rebuild_statements(dialect_name, tables=["tasks"]):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in downgrade_statements(op.get_bind().dialect.name):
+        op.execute(sa.text(statement))
+    op.drop_table("task_counters")
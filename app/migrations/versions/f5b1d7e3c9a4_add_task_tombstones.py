@@ -0,0 +1,56 @@
+"""add task tombstones
+
+Revision ID: f5b1d7e3c9a4
+Revises: e2a9c6f4b8d1
+Create Date: 2026-10-18 15:02:31.774019
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f5b1d7e3c9a4"
+down_revision: Union[str, Sequence[str], None] = "e2a9c6f4b8d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_owner_deleted_at_task",
+        "task_tombstones",
+        ["owner_id", "deleted_at", "task_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_task_tombstones_deleted_at",
+        "task_tombstones",
+        ["deleted_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones")
+    op.drop_index(
+        "ix_task_tombstones_owner_deleted_at_task", table_name="task_tombstones"
+    )
+    op.drop_table("task_tombstones")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index, text
 from datetime import datetime, timezone
 
 from app.db.database import Base
@@ -25,6 +25,30 @@ class Task(Base):
     """Database model for user tasks."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_owner_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_tasks_owner_deadline_id", "owner_id", "deadline", "id"),
+        Index("ix_tasks_owner_updated_at_id", "owner_id", "updated_at", "id"),
+        # Only completed tasks, which the archival job scans by age.
+        Index(
+            "ix_tasks_done_updated_at_id",
+            "updated_at",
+            "id",
+            postgresql_where=text("status = 'DONE'"),
+            sqlite_where=text("status = 'DONE'"),
+        ),
+        # Open tasks by deadline across all users, for the deadline scheduler.
+        Index(
+            "ix_tasks_open_deadline_id",
+            "deadline",
+            "id",
+            postgresql_where=text("status != 'DONE'"),
+            sqlite_where=text("status != 'DONE'"),
+        ),
+        # Archived tasks keep their IDs, so SQLite must never hand out the ID
+        # of a task that was moved away; PostgreSQL sequences never do.
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(100), nullable=False)
@@ -35,3 +59,76 @@ class Task(Base):
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), default=utc_now)
     updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
+
+
+class TaskArchive(Base):
+    """Completed task moved out of ``tasks`` by the archival job.
+
+    Rows keep the ID and columns they had in ``tasks`` and are never updated;
+    restoring a task moves it back.
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_owner_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_tasks_archive_owner_deadline_id", "owner_id", "deadline", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(100), nullable=False)
+    description = Column(String(1000), nullable=True)
+    deadline = Column(DateTime(timezone=True), nullable=True)
+    status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.DONE)
+    priority = Column(Enum(TaskPriority), nullable=False, default=TaskPriority.NONE)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+
+class TaskCounter(Base):
+    """Per-user task counts by status or priority, maintained by triggers."""
+
+    __tablename__ = "task_counters"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    dimension = Column(String(16), primary_key=True)
+    value = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TaskTombstone(Base):
+    """Marker left behind by a deleted task so clients can sync the deletion."""
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index(
+            "ix_task_tombstones_owner_deleted_at_task",
+            "owner_id",
+            "deleted_at",
+            "task_id",
+        ),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+
+class RefreshToken(Base):
+    """A login session, identified by the SHA-256 of its current refresh token.
+
+    Rotation replaces the hash in place and keeps the one before it, so a
+    replayed old token can be recognised and the session revoked.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    previous_hash = Column(String(64), nullable=True, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
@@ -0,0 +1,102 @@
+import itertools
+import json
+import logging
+import os
+
+from dotenv import load_dotenv
+
+from app.db.database import settings
+from app.metrics.instruments import ADMISSION_REJECTED
+from app.ratelimit.backends import MemoryAdmissionBackend, RedisAdmissionBackend
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "none" disables admission control, "memory" limits each worker, "redis"
+# applies ADMISSION_MAX_IN_FLIGHT to all workers together.
+ADMISSION_BACKEND = os.getenv("ADMISSION_BACKEND", "memory")
+ADMISSION_REDIS_URL = os.getenv("ADMISSION_REDIS_URL", "redis://localhost:6379/0")
+# By default a worker admits twice as many requests as it has connections, so
+# the pool queue stays short and excess load is refused instead of timing out.
+# The redis limit covers every worker of every instance, which no per-process
+# default can know, so it has to be set.
+if ADMISSION_BACKEND == "redis" and not os.getenv("ADMISSION_MAX_IN_FLIGHT"):
+    raise RuntimeError(
+        "ADMISSION_MAX_IN_FLIGHT must be set with ADMISSION_BACKEND=redis"
+    )
+ADMISSION_MAX_IN_FLIGHT = int(
+    os.getenv("ADMISSION_MAX_IN_FLIGHT")
+    or (settings.pool_size + settings.max_overflow) * 2
+)
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+ADMISSION_LEASE_SECONDS = float(os.getenv("ADMISSION_LEASE_SECONDS", "60"))
+# Operational endpoints stay reachable under load; event streams are long-lived
+# and do not hold a connection, so they must not use up admission slots.
+ADMISSION_EXEMPT_PREFIXES = ("/metrics", "/internal/", "/tasks/stream")
+
+_BUSY_BODY = json.dumps({"detail": "Server is busy, retry later"}).encode()
+
+
+class AdmissionMiddleware:
+    """Sheds load with 503 and Retry-After once too many requests are in flight."""
+
+    def __init__(self, app, backend=None, limit: int = ADMISSION_MAX_IN_FLIGHT):
+        self.app = app
+        self.backend = backend if backend is not None else _backend_from_env()
+        self.limit = limit
+        self._tokens = itertools.count()
+        self._prefix = f"{os.getpid()}:"
+
+    async def __call__(self, scope, receive, send):
+        if (
+            self.backend is None
+            or scope["type"] != "http"
+            or scope["path"].startswith(ADMISSION_EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        token = f"{self._prefix}{next(self._tokens)}"
+        try:
+            admitted = await self.backend.acquire(token, self.limit)
+        except Exception:
+            logger.warning("Admission backend failed", exc_info=True)
+            await self.app(scope, receive, send)
+            return
+        if not admitted:
+            ADMISSION_REJECTED.inc()
+            await _reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            try:
+                await self.backend.release(token)
+            except Exception:
+                logger.warning("Admission backend failed", exc_info=True)
+
+
+async def _reject(send) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_BUSY_BODY)).encode()),
+                (b"retry-after", str(ADMISSION_RETRY_AFTER).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": _BUSY_BODY})
+
+
+def _backend_from_env():
+    if ADMISSION_BACKEND == "memory":
+        return MemoryAdmissionBackend()
+    if ADMISSION_BACKEND == "redis":
+        return RedisAdmissionBackend.from_url(
+            ADMISSION_REDIS_URL, ADMISSION_LEASE_SECONDS
+        )
+    return None
@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Tuple
+
+# Token bucket refilled continuously at ``rate`` tokens per second. Returns
+# {allowed, tokens left}; tokens are returned as a string because Redis
+# truncates Lua numbers to integers.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+# Sorted set of in-flight request leases scored by start time in ms. Leases
+# older than ARGV[2] ms are dropped first, so a crashed worker cannot leak
+# capacity for longer than one lease.
+_ACQUIRE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - lease)
+if redis.call('ZCARD', KEYS[1]) >= limit then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], lease)
+return 1
+"""
+
+
+def _redis_from_url(url: str):
+    """Connect with redis-py, which is only needed for the shared backends."""
+    import redis.asyncio
+
+    return redis.asyncio.from_url(url)
+
+
+class MemoryRateLimitBackend:
+    """Token buckets kept in this worker; each worker enforces its own share."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    async def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Evicting a bucket only forgets a client's debt, never adds one.
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+
+class RedisRateLimitBackend:
+    """Token buckets shared by all workers, updated atomically by a Lua script."""
+
+    def __init__(self, client, prefix: str = "ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        return cls(_redis_from_url(url))
+
+    async def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(
+            keys=[f"{self.prefix}:{key}"], args=[capacity, rate]
+        )
+        return bool(allowed), float(tokens)
+
+
+class MemoryAdmissionBackend:
+    """Counts requests in flight in this worker."""
+
+    def __init__(self):
+        self.in_flight = 0
+
+    async def acquire(self, token: str, limit: int) -> bool:
+        if self.in_flight >= limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    async def release(self, token: str) -> None:
+        self.in_flight -= 1
+
+
+class RedisAdmissionBackend:
+    """Counts requests in flight across all workers as expiring leases."""
+
+    def __init__(self, client, lease: float, key: str = "admission:in_flight"):
+        self.client = client
+        self.lease_ms = max(int(lease * 1000), 1)
+        self.key = key
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, lease: float) -> "RedisAdmissionBackend":
+        return cls(_redis_from_url(url), lease)
+
+    async def acquire(self, token: str, limit: int) -> bool:
+        return bool(
+            await self._acquire(keys=[self.key], args=[limit, self.lease_ms, token])
+        )
+
+    async def release(self, token: str) -> None:
+        await self.client.zrem(self.key, token)
@@ -0,0 +1,128 @@
+import logging
+import math
+import os
+from typing import Dict, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request
+
+from app.auth.jwt_handler import get_current_user
+from app.metrics.instruments import RATE_LIMITED
+from app.models.models import User
+from app.ratelimit.backends import MemoryRateLimitBackend, RedisRateLimitBackend
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "none" disables limiting, "memory" limits per worker, "redis" across workers.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+
+# Budgets as "<requests>/<seconds>", overridable with RATE_LIMIT_<NAME>. The
+# count is also the burst size; tokens refill evenly over the period.
+DEFAULT_POLICIES = {
+    "auth": "10/60",
+    "refresh": "60/60",
+    "read": "300/60",
+    "write": "120/60",
+    "bulk": "10/60",
+}
+
+# Routes with their own budget; other routes use "read" for GET and HEAD and
+# "write" for everything else.
+ROUTE_POLICIES = {
+    ("POST", "/tasks/bulk"): "bulk",
+    ("PATCH", "/tasks/bulk"): "bulk",
+    ("DELETE", "/tasks/bulk"): "bulk",
+    ("POST", "/tasks/import"): "bulk",
+    ("GET", "/tasks/export"): "bulk",
+}
+
+
+def parse_policy(spec: str) -> Tuple[float, float]:
+    """Turn ``"<requests>/<seconds>"`` into ``(capacity, tokens per second)``."""
+    count, _, seconds = spec.partition("/")
+    capacity = float(count)
+    return capacity, capacity / float(seconds or 1)
+
+
+def policy_for(method: str, path: str) -> str:
+    """Name of the budget that applies to a route."""
+    policy = ROUTE_POLICIES.get((method, path))
+    if policy is not None:
+        return policy
+    return "read" if method in ("GET", "HEAD") else "write"
+
+
+class RateLimiter:
+    """Applies named token-bucket budgets to clients through a backend."""
+
+    def __init__(self, backend, policies: Dict[str, str]):
+        self.backend = backend
+        self.policies = {name: parse_policy(spec) for name, spec in policies.items()}
+
+    async def check(self, policy: str, subject: str) -> None:
+        """Spend one token of ``subject``'s ``policy`` budget or raise 429.
+
+        Backend failures are logged and the request is let through.
+        """
+        if self.backend is None:
+            return
+        capacity, rate = self.policies[policy]
+        try:
+            allowed, tokens = await self.backend.take(
+                f"{policy}:{subject}", capacity, rate
+            )
+        except Exception:
+            logger.warning("Rate limit backend failed", exc_info=True)
+            return
+        if allowed:
+            return
+        RATE_LIMITED.inc(policy)
+        retry_after = max(math.ceil((1 - tokens) / rate), 1)
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def _backend_from_env():
+    if RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimitBackend()
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend.from_url(RATE_LIMIT_REDIS_URL)
+    return None
+
+
+rate_limiter = RateLimiter(
+    _backend_from_env(),
+    {
+        name: os.getenv(f"RATE_LIMIT_{name.upper()}", default)
+        for name, default in DEFAULT_POLICIES.items()
+    },
+)
+
+
+def limit_by_ip(policy: str):
+    """Dependency limiting anonymous routes per client address.
+
+    Behind a proxy the address comes from X-Forwarded-For as trusted by the
+    server's ``forwarded_allow_ips``.
+    """
+
+    async def dependency(request: Request) -> None:
+        host = request.client.host if request.client else "unknown"
+        await rate_limiter.check(policy, f"ip:{host}")
+
+    return dependency
+
+
+async def limit_by_user(
+    request: Request, current_user: User = Depends(get_current_user)
+) -> None:
+    """Dependency limiting authenticated routes per user and route budget."""
+    route = request.scope.get("route")
+    policy = policy_for(request.method, getattr(route, "path", ""))
+    await rate_limiter.check(policy, f"user:{current_user.id}")
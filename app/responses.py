@@ -0,0 +1,67 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by orjson, or pydantic-core when it is missing.
+
+    Both encoders handle datetimes and enums natively and format them the same
+    way pydantic does, so payloads match those of the default response path.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+        return to_json(content)
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from values that change whenever the body does."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime for Last-Modified, treating naive values as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """Evaluate If-None-Match (or, without it, If-Modified-Since) for a GET."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = if_none_match.split(",")
+        candidates = {tag.strip().removeprefix("W/") for tag in tags}
+        return "*" in candidates or etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(headers: dict) -> Response:
+    """Return an empty 304 carrying the validators of the current version."""
+    return Response(status_code=304, headers=headers)
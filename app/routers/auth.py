@@ -3,17 +3,22 @@ from fastapi.security import OAuth2PasswordRequestForm
 from starlette import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.hash import verify_password
+from app.auth.hash import verify_and_update_password_async
 from app.auth.jwt_handler import create_access_token
-from app.crud.user_crud import get_user_by_email, create_user
+from app.crud.refresh_token_crud import issue_refresh_token, rotate_refresh_token
+from app.crud.user_crud import get_user_by_email, create_user, rehash_user_password
 from app.db.database import get_db
-from app.schemas.user import UserCreate, UserResponse, Token
+from app.ratelimit.limiter import limit_by_ip
+from app.schemas.user import UserCreate, UserResponse, Token, RefreshRequest
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
 @router.post(
-    "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_by_ip("auth"))],
 )
 async def register_user(
     user: UserCreate, db: AsyncSession = Depends(get_db)
@@ -23,11 +28,13 @@ async def register_user(
     return new_user
 
 
-@router.post("/token", response_model=Token)
+@router.post(
+    "/token", response_model=Token, dependencies=[Depends(limit_by_ip("auth"))]
+)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ) -> Token:
-    """Authenticate user and return a JWT access token."""
+    """Authenticate user and return a JWT access token and a refresh token."""
     user = await get_user_by_email(db, form_data.username)
     if not user:
         raise HTTPException(
@@ -35,13 +42,42 @@ async def login_for_access_token(
             detail="User does not exist",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    if not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password_async(
+        form_data.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash is not None:
+        await rehash_user_password(db, user, new_hash)
 
     payload = {"sub": str(user.id)}
     access_token = create_access_token(data=payload)
-    return {"access_token": access_token, "token_type": "bearer"}
+    refresh_token = await issue_refresh_token(db, user.id)
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+@router.post(
+    "/refresh", response_model=Token, dependencies=[Depends(limit_by_ip("refresh"))]
+)
+async def refresh_access_token(
+    request: RefreshRequest, db: AsyncSession = Depends(get_db)
+) -> Token:
+    """Exchange a refresh token for a new access token and refresh token.
+
+    Each refresh token works once; reusing one revokes its session.
+    """
+    user_id, refresh_token = await rotate_refresh_token(db, request.refresh_token)
+    access_token = create_access_token(data={"sub": str(user_id)})
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
@@ -0,0 +1,65 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.cache.task_cache import task_list_cache
+from app.db.database import async_engine, settings
+from app.db.pool import pool_status
+from app.events.task_events import task_events
+from app.scheduler.deadlines import deadline_scheduler
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN")
+# Without a token the endpoints are hidden unless this explicitly opts out,
+# e.g. for local development or a network that is private anyway.
+INTERNAL_ENDPOINTS_PUBLIC = os.getenv(
+    "INTERNAL_ENDPOINTS_PUBLIC", "false"
+).lower() in {"1", "true", "yes", "on"}
+
+
+async def require_internal_access(
+    x_internal_token: Optional[str] = Header(None),
+) -> None:
+    """Guard internal endpoints with INTERNAL_TOKEN; fail closed without one."""
+    if not INTERNAL_TOKEN:
+        if INTERNAL_ENDPOINTS_PUBLIC:
+            return
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(
+        x_internal_token.encode(), INTERNAL_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+
+@router.get("/db-pool", dependencies=[Depends(require_internal_access)])
+async def db_pool_status():
+    """Report pool sizing, checked-out/idle/overflow connections and wait times."""
+    return {
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_timeout": settings.pool_timeout,
+        "pool_recycle": settings.pool_recycle,
+        "pool_pre_ping": settings.pool_pre_ping,
+        **pool_status(async_engine),
+    }
+
+
+@router.get("/cache", dependencies=[Depends(require_internal_access)])
+async def cache_status():
+    """Report the task list cache backend and its hit/miss counters."""
+    return task_list_cache.stats()
+
+
+@router.get("/events", dependencies=[Depends(require_internal_access)])
+async def events_status():
+    """Report the task event broker, its subscribers and dropped events."""
+    return task_events.stats()
+
+
+@router.get("/scheduler", dependencies=[Depends(require_internal_access)])
+async def scheduler_status():
+    """Report the deadline scheduler's loaded window and delivery counters."""
+    return deadline_scheduler.stats()
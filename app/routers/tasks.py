@@ -1,27 +1,87 @@
-from datetime import datetime
+import csv
+import io
+import json
+from datetime import datetime, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+    Query,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.jwt_handler import get_current_user
+from app.cache.task_cache import task_list_cache
+from app.crud.pagination import encode_cursor, normalize_order
 from app.db.database import get_db
+from app.db.replicas import get_read_db, read_sessionmaker
+from app.events.task_events import EVENTS_HEARTBEAT_SECONDS, task_events
+from app.metrics.query_budget import query_budget
 from app.models.enums import TaskPriority, TaskStatus
 from app.models.models import User
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.ratelimit.limiter import limit_by_user
+from app.responses import (
+    FastJSONResponse,
+    http_date,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from app.schemas.task import (
+    BULK_MAX_ITEMS,
+    TaskBulkDelete,
+    TaskBulkResponse,
+    TaskBulkUpdateItem,
+    TaskChangeFeed,
+    TaskCreate,
+    TaskImportSummary,
+    TaskStats,
+    TaskUpdate,
+    TaskResponse,
+)
 from app.crud.task_crud import (
     create_task,
-    get_tasks_by_user,
-    get_task_by_id,
+    create_tasks,
+    get_due_tasks,
+    get_task_changes,
+    get_task_collection_version,
+    get_task_row_by_id,
+    get_task_stats,
+    get_task_rows_by_user,
     update_task,
     delete_task,
+    delete_tasks,
+    restore_task,
     search_tasks,
+    stream_tasks_by_user,
+    update_tasks,
+)
+from app.crud.task_import import import_tasks
+
+router = APIRouter(
+    prefix="/tasks", tags=["tasks"], dependencies=[Depends(limit_by_user)]
 )
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+MAX_PAGE_SIZE = 10000
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_duration(value: str) -> timedelta:
+    """Turn ``90``, ``90s``, ``15m``, ``2h`` or ``7d`` into a timedelta."""
+    if value[-1] in DURATION_UNITS:
+        return timedelta(seconds=int(value[:-1]) * DURATION_UNITS[value[-1]])
+    return timedelta(seconds=int(value))
 
 
 @router.post("/", response_model=TaskResponse)
+@query_budget(3)
 async def create_task_handler(
     task: TaskCreate,
     db: AsyncSession = Depends(get_db),
@@ -31,9 +91,101 @@ async def create_task_handler(
     return await create_task(db, task, owner_id=current_user.id)
 
 
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def create_tasks_bulk_handler(
+    tasks: List[TaskCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create many tasks for the current user in one transaction."""
+    created = await create_tasks(db, tasks, owner_id=current_user.id)
+    return {
+        "results": [
+            {"index": index, "id": task.id, "status": "created", "task": task}
+            for index, task in enumerate(created)
+        ]
+    }
+
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def update_tasks_bulk_handler(
+    items: List[TaskBulkUpdateItem] = Body(
+        ..., min_length=1, max_length=BULK_MAX_ITEMS
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Partially update many of the current user's tasks in one transaction.
+
+    Archived tasks are reported as ``archived`` and left unchanged, as
+    ``PUT /tasks/{id}`` answers 409 for them.
+    """
+    tasks, archived_ids = await update_tasks(db, items, owner_id=current_user.id)
+    updated = {task.id: task for task in tasks}
+    archived = set(archived_ids)
+
+    def item_status(task_id: int) -> str:
+        if task_id in updated:
+            return "updated"
+        return "archived" if task_id in archived else "not_found"
+
+    return {
+        "results": [
+            {
+                "index": index,
+                "id": item.id,
+                "status": item_status(item.id),
+                "task": updated.get(item.id),
+            }
+            for index, item in enumerate(items)
+        ]
+    }
+
+
+@router.delete("/bulk", response_model=TaskBulkResponse)
+async def delete_tasks_bulk_handler(
+    request: TaskBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete many of the current user's tasks in one statement."""
+    deleted = set(await delete_tasks(db, request.ids, owner_id=current_user.id))
+    return {
+        "results": [
+            {
+                "index": index,
+                "id": task_id,
+                "status": "deleted" if task_id in deleted else "not_found",
+            }
+            for index, task_id in enumerate(request.ids)
+        ]
+    }
+
+
+@router.post("/import", response_model=TaskImportSummary)
+async def import_tasks_handler(
+    request: Request,
+    import_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Import tasks for the current user from an NDJSON or CSV request body.
+
+    The body is parsed as it arrives and committed in fixed-size batches;
+    invalid rows are skipped and reported with their line numbers.
+    """
+    return await import_tasks(
+        db, request.stream(), import_format, owner_id=current_user.id
+    )
+
+
 @router.get("/", response_model=List[TaskResponse])
+@query_budget(3)
 async def get_tasks_by_user_handler(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
     priority: Optional[TaskPriority] = Query(
@@ -45,7 +197,9 @@ async def get_tasks_by_user_handler(
     deadline_after: Optional[datetime] = Query(
         None, description="Tasks with deadline after this date"
     ),
-    limit: int = Query(100, description="Maximum number of tasks to return"),
+    limit: int = Query(
+        100, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of tasks to return"
+    ),
     offset: int = Query(0, description="Number of tasks to skip"),
     order_by: str = Query(
         "created_at", description="Sort by 'created_at' or 'deadline'"
@@ -54,52 +208,332 @@ async def get_tasks_by_user_handler(
     show_completed: bool = Query(
         True, description="Whether to include completed tasks"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from X-Next-Cursor; replaces offset when given",
+    ),
+    include_archived: bool = Query(
+        False, description="Whether to include archived completed tasks"
+    ),
 ):
-    """Retrieve all tasks belonging to the current user with filters and sorting."""
-    tasks = await get_tasks_by_user(
-        db=db,
-        user_id=current_user.id,
-        status=status,
-        priority=priority,
-        deadline_before=deadline_before,
-        deadline_after=deadline_after,
+    """Retrieve all tasks belonging to the current user with filters and sorting.
+
+    When a full page is returned, the ``X-Next-Cursor`` response header carries
+    the cursor for the next page. The ETag combines the user's collection
+    version with the query string, so a matching ``If-None-Match`` is answered
+    with 304 before any task row is read.
+    """
+    count, last_updated = await get_task_collection_version(
+        db, current_user.id, include_archived
+    )
+    etag = make_etag(
+        "tasks",
+        current_user.id,
+        count,
+        last_updated,
+        sorted(request.query_params.multi_items()),
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if is_not_modified(request, etag):
+        return not_modified(headers)
+
+    order_by, order_dir = normalize_order(order_by, order_dir)
+    filters = {
+        "status": status,
+        "priority": priority,
+        "deadline_before": deadline_before,
+        "deadline_after": deadline_after,
+        "limit": limit,
+        "offset": offset,
+        "order_by": order_by,
+        "order_dir": order_dir,
+        "show_completed": show_completed,
+        "cursor": cursor,
+        "include_archived": include_archived,
+    }
+    cache_key = task_list_cache.key(current_user.id, filters, (count, last_updated))
+    cached = await task_list_cache.get(cache_key)
+    if cached is not None:
+        body, next_cursor = cached
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return Response(body, media_type="application/json", headers=headers)
+
+    rows = await get_task_rows_by_user(db=db, user_id=current_user.id, **filters)
+    next_cursor = ""
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last[order_by], last["id"], order_by, order_dir)
+        headers["X-Next-Cursor"] = next_cursor
+    # Rows come straight from the database with exactly the TaskResponse
+    # columns, so they are encoded as-is instead of being re-validated.
+    response = FastJSONResponse([dict(row) for row in rows], headers=headers)
+    await task_list_cache.set(cache_key, response.body, next_cursor)
+    return response
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "deadline",
+    "status",
+    "priority",
+    "owner_id",
+    "created_at",
+    "updated_at",
+]
+
+
+def _ndjson_batch(tasks) -> str:
+    """Serialize a batch of tasks as newline-delimited JSON."""
+    return "".join(
+        TaskResponse.model_validate(task).model_dump_json() + "\n" for task in tasks
+    )
+
+
+def _csv_rows(rows) -> str:
+    """Serialize rows of values as CSV text."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _csv_batch(tasks) -> str:
+    """Serialize a batch of tasks as CSV rows in EXPORT_FIELDS order."""
+    rows = []
+    for task in tasks:
+        data = TaskResponse.model_validate(task).model_dump(mode="json")
+        rows.append([data[field] for field in EXPORT_FIELDS])
+    return _csv_rows(rows)
+
+
+@router.get("/export")
+async def export_tasks_handler(
+    current_user: User = Depends(get_current_user),
+    export_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"
+    ),
+    status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
+    priority: Optional[TaskPriority] = Query(
+        None, description="Filter by task priority"
+    ),
+    deadline_before: Optional[datetime] = Query(
+        None, description="Tasks with deadline before this date"
+    ),
+    deadline_after: Optional[datetime] = Query(
+        None, description="Tasks with deadline after this date"
+    ),
+    order_by: str = Query(
+        "created_at", description="Sort by 'created_at' or 'deadline'"
+    ),
+    order_dir: str = Query("asc", description="Sort direction: 'asc' or 'desc'"),
+    show_completed: bool = Query(
+        True, description="Whether to include completed tasks"
+    ),
+):
+    """Stream every task of the current user matching the filters.
+
+    Rows are read through a server-side cursor and written out batch by batch,
+    so memory use does not grow with the number of tasks.
+    """
+    user_id = current_user.id
+    serialize = _csv_batch if export_format == "csv" else _ndjson_batch
+
+    async def body():
+        # The request-scoped session is closed before a streaming body is
+        # sent, so the export owns its session for the lifetime of the stream.
+        async with (await read_sessionmaker(user_id))() as session:
+            if export_format == "csv":
+                yield _csv_rows([EXPORT_FIELDS])
+            async for batch in stream_tasks_by_user(
+                session,
+                user_id=user_id,
+                status=status,
+                priority=priority,
+                deadline_before=deadline_before,
+                deadline_after=deadline_after,
+                order_by=order_by,
+                order_dir=order_dir,
+                show_completed=show_completed,
+            ):
+                yield serialize(batch)
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
+
+
+def _sse_events(events: List[dict]) -> str:
+    """Render task events in the text/event-stream wire format."""
+    return "".join(
+        f"event: task\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+        for event in events
+    )
+
+
+@router.get("/stream")
+async def stream_task_events(current_user: User = Depends(get_current_user)):
+    """Push the current user's task changes as Server-Sent Events.
+
+    Each ``task`` event carries ``op`` (``upsert``, ``delete`` or ``resync``)
+    and, for upserts, the task itself. ``resync`` means events were dropped
+    and the client should catch up through ``GET /tasks/changes``. Comment
+    lines are sent while idle to keep proxies from closing the connection.
+    """
+    user_id = current_user.id
+
+    async def body():
+        subscription = await task_events.subscribe(user_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                events = await subscription.get(timeout=EVENTS_HEARTBEAT_SECONDS)
+                yield _sse_events(events) if events else ": keep-alive\n\n"
+        finally:
+            await task_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/changes", response_model=TaskChangeFeed)
+@query_budget(3)
+async def get_task_changes_handler(
+    since: Optional[str] = Query(
+        None, description="Cursor from a previous response; omit for a full sync"
+    ),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum changes to return"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Return tasks created, updated or deleted since the given cursor."""
+    changes, next_cursor, has_more = await get_task_changes(
+        db, current_user.id, since=since, limit=limit
+    )
+    return {"changes": changes, "next_cursor": next_cursor, "has_more": has_more}
+
+
+@router.get("/stats", response_model=TaskStats)
+@query_budget(3)
+async def get_task_stats_handler(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Summarise the current user's tasks by status, priority and deadline."""
+    return await get_task_stats(db, current_user.id)
+
+
+@router.get("/due", response_model=List[TaskResponse])
+@query_budget(2)
+async def get_due_tasks_handler(
+    within: str = Query(
+        "24h",
+        pattern=r"^\d{1,6}[smhd]?$",
+        description="How far ahead to look: seconds, or a number with s, m, h or d",
+    ),
+    include_overdue: bool = Query(
+        False, description="Also return open tasks already past their deadline"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum tasks to return"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from X-Next-Cursor"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List the current user's open tasks due soon, earliest deadline first."""
+    rows = await get_due_tasks(
+        db,
+        current_user.id,
+        _parse_duration(within),
+        include_overdue=include_overdue,
         limit=limit,
-        offset=offset,
-        order_by=order_by,
-        order_dir=order_dir,
-        show_completed=show_completed,
+        cursor=cursor,
     )
-    return tasks
+    headers = {}
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(
+            last["deadline"], last["id"], "deadline", "asc"
+        )
+    return FastJSONResponse([dict(row) for row in rows], headers=headers)
 
 
 @router.get("/search", response_model=List[TaskResponse])
+@query_budget(2)
 async def search_tasks_handler(
+    response: Response,
+    q: Optional[str] = Query(
+        None, description="Full-text query over title and description"
+    ),
     title: str = None,
     description: str = None,
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Maximum results to return"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from X-Next-Cursor"
+    ),
+    include_archived: bool = Query(
+        False, description="Whether to search archived completed tasks too"
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Search for tasks owned by the current user."""
-    tasks = await search_tasks(
-        db=db, owner_id=current_user.id, title=title, description=description
+    """Search for tasks owned by the current user, best matches first."""
+    tasks, next_cursor = await search_tasks(
+        db=db,
+        owner_id=current_user.id,
+        q=q,
+        title=title,
+        description=description,
+        limit=limit,
+        cursor=cursor,
+        include_archived=include_archived,
     )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return tasks
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
+@query_budget(2)
 async def get_task_by_id_handler(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    include_archived: bool = Query(
+        False, description="Whether to look the task up in the archive too"
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Fetch a specific task if owned by the current user."""
-    task = await get_task_by_id(db, task_id)
-    if task.owner_id != current_user.id:
+    """Fetch a specific task if owned by the current user.
+
+    Responses carry a strong ETag and Last-Modified derived from
+    ``updated_at``; matching conditional requests get an empty 304.
+    """
+    task = await get_task_row_by_id(db, task_id, include_archived)
+    if task["owner_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed to access this task")
-    return task
+
+    etag = make_etag("task", task["id"], task["updated_at"])
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if task["updated_at"] is not None:
+        headers["Last-Modified"] = http_date(task["updated_at"])
+    if is_not_modified(request, etag, task["updated_at"]):
+        return not_modified(headers)
+    return FastJSONResponse(dict(task), headers=headers)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
+@query_budget(2)
 async def update_task_handler(
     task: TaskUpdate,
     task_id: int,
@@ -107,22 +541,26 @@ async def update_task_handler(
     current_user: User = Depends(get_current_user),
 ):
     """Update a task if owned by the current user."""
-    existing_task = await get_task_by_id(db, task_id)
-    if existing_task.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to update this task")
+    return await update_task(db, task_id, task, owner_id=current_user.id)
 
-    return await update_task(db, task_id, task)
+
+@router.post("/{task_id}/restore", response_model=TaskResponse)
+@query_budget(4)
+async def restore_task_handler(
+    task_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Move an archived task of the current user back to the active tasks."""
+    return await restore_task(db, task_id, owner_id=current_user.id)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)
 async def delete_task_handler(
     task_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete a task if owned by the current user."""
-    task = await get_task_by_id(db, task_id)
-    if task.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to delete this task")
-
-    await delete_task(db, task_id)
+    await delete_task(db, task_id, owner_id=current_user.id)
@@ -1,16 +1,21 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.jwt_handler import get_current_user
+from app.auth.jwt_handler import get_current_user, get_current_user_from_db
 from app.crud.user_crud import update_user_email, update_user_password
 from app.db.database import get_db
+from app.metrics.query_budget import query_budget
 from app.models.models import User
+from app.ratelimit.limiter import limit_by_user
 from app.schemas.user import UserResponse, UpdateEmailRequest, UpdatePasswordRequest
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(
+    prefix="/users", tags=["users"], dependencies=[Depends(limit_by_user)]
+)
 
 
 @router.get("/me", response_model=UserResponse)
+@query_budget(1)
 async def read_current_user(current_user: User = Depends(get_current_user)):
     """Return the currently authenticated user's information."""
     return current_user
@@ -20,7 +25,7 @@ async def read_current_user(current_user: User = Depends(get_current_user)):
 async def update_email(
     request: UpdateEmailRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_from_db),
 ):
     """Update the current user's email address."""
     updated_user = await update_user_email(
@@ -33,7 +38,7 @@ async def update_email(
 async def update_password(
     request: UpdatePasswordRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_from_db),
 ):
     """Update the current user's password."""
     await update_user_password(
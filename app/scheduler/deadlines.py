@@ -0,0 +1,336 @@
+"""In-process scheduler that fires hooks when open tasks reach their deadline.
+
+Only deadlines in the next ``DEADLINE_WINDOW_SECONDS`` are held in memory, in
+a heap. The window is re-read every ``DEADLINE_REFRESH_SECONDS`` with a range
+query on the partial ``(deadline, id)`` index of open tasks, so each refresh
+costs the number of tasks due soon, not the size of the table. Writes made in
+this process reschedule their tasks at once; writes made by other processes
+are picked up at the next refresh.
+
+On PostgreSQL every process may enable it: they elect one runner through a
+session advisory lock held on a dedicated connection, and the others retry the
+lock at each refresh, taking over within ``DEADLINE_REFRESH_SECONDS`` when the
+runner goes away. On other databases every process that enables it fires the
+hooks, so enable it in one process only.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, func, literal, literal_column, or_, select
+
+from app.db.change_feed import as_utc
+from app.db.database import async_engine, async_session
+from app.metrics.instruments import DEADLINE_REMINDERS
+from app.models.enums import TaskStatus
+from app.models.models import Task, utc_now
+from app.scheduler.hooks import hooks_from_env
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_SCHEDULER = os.getenv("DEADLINE_SCHEDULER", "false").lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+DEADLINE_WINDOW_SECONDS = float(os.getenv("DEADLINE_WINDOW_SECONDS", "600"))
+DEADLINE_REFRESH_SECONDS = float(os.getenv("DEADLINE_REFRESH_SECONDS", "60"))
+DEADLINE_BATCH_SIZE = int(os.getenv("DEADLINE_BATCH_SIZE", "1000"))
+
+# Key of the PostgreSQL advisory lock held by the process running the scheduler.
+DEADLINE_LOCK_KEY = int(os.getenv("DEADLINE_LOCK_KEY", "7461736"))
+
+# Spelled out instead of bound so the planner can use the partial index on
+# open tasks.
+IS_OPEN = Task.status != literal_column("'DONE'")
+
+
+def _entry(task) -> dict:
+    """The fields hooks receive for a due task."""
+    return {
+        "id": task.id,
+        "owner_id": task.owner_id,
+        "title": task.title,
+        "deadline": as_utc(task.deadline),
+    }
+
+
+class DeadlineScheduler:
+    """Heap of the open tasks due within the loaded window.
+
+    Tasks are indexed by ID; the heap holds ``(deadline, id)`` pairs and
+    entries that no longer match the index are skipped when popped, so a
+    reschedule is a dict write plus a heap push.
+    """
+
+    def __init__(
+        self,
+        hooks: list,
+        window: float,
+        refresh: float,
+        batch_size: int,
+        session_factory=async_session,
+        engine=async_engine,
+    ):
+        self.hooks = hooks
+        # A refresh must load every deadline that can fall due before the next.
+        self.window = timedelta(seconds=max(window, refresh))
+        self.refresh = timedelta(seconds=refresh)
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.engine = engine
+        self.leader = False
+        self._lock = None
+        self._tasks: Dict[int, dict] = {}
+        self._heap: List[Tuple[datetime, int]] = []
+        self._touched: Set[int] = set()
+        self._fired_until: Optional[datetime] = None
+        self._loaded_until: Optional[datetime] = None
+        self._reload = False
+        self._wake = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self.loads = 0
+        self.fired = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    async def start(self) -> None:
+        """Start firing from now on, once elected; past deadlines are not fired."""
+        if self._runner is not None:
+            return
+        self._fired_until = self._loaded_until = utc_now()
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the scheduler and close the hooks."""
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        await asyncio.gather(self._runner, return_exceptions=True)
+        self._runner = None
+        await self._resign()
+        for hook in self.hooks:
+            await hook.close()
+
+    def schedule(self, tasks: Iterable) -> None:
+        """Reschedule tasks whose deadline, status or title may have changed."""
+        if not self.leader:
+            return
+        for task in tasks:
+            self._touched.add(task.id)
+            self._place(task)
+
+    def forget(self, task_ids: Iterable[int]) -> None:
+        """Drop deleted tasks."""
+        if not self.leader:
+            return
+        for task_id in task_ids:
+            self._touched.add(task_id)
+            self._tasks.pop(task_id, None)
+
+    def reload(self) -> None:
+        """Re-read the window now, for writes too large to reschedule one by one."""
+        if not self.leader:
+            return
+        self._reload = True
+        self._wake.set()
+
+    async def _elect(self) -> bool:
+        """Whether this process runs the scheduler, taking the lock if it is free.
+
+        The lock belongs to the session, so its connection is kept out of the
+        pool and pinged at every refresh; losing it drops the loaded window.
+        """
+        if self.engine.dialect.name != "postgresql":
+            if not self.leader:
+                self._lead()
+            return True
+        try:
+            if self._lock is None:
+                connection = await self.engine.connect()
+                try:
+                    acquired = await connection.scalar(
+                        select(func.pg_try_advisory_lock(DEADLINE_LOCK_KEY))
+                    )
+                    await connection.commit()
+                except BaseException:
+                    await connection.close()
+                    raise
+                if not acquired:
+                    await connection.close()
+                    return False
+                self._lock = connection
+                self._lead()
+            else:
+                await self._lock.scalar(select(literal(1)))
+                await self._lock.commit()
+        except Exception:
+            logger.warning("Holding the deadline scheduler lock failed", exc_info=True)
+            await self._resign()
+            return False
+        return True
+
+    def _lead(self) -> None:
+        self.leader = True
+        self._fired_until = self._loaded_until = utc_now()
+        logger.info("Running the deadline scheduler in this process")
+
+    async def _resign(self) -> None:
+        """Give up the lock and forget the loaded window."""
+        self.leader = False
+        self._tasks = {}
+        self._heap = []
+        if self._lock is not None:
+            lock, self._lock = self._lock, None
+            # Discarding the connection ends the session and with it the lock,
+            # even when the server can no longer be reached to unlock it.
+            try:
+                await lock.invalidate()
+                await lock.close()
+            except Exception:
+                logger.warning("Releasing the deadline scheduler lock failed")
+
+    def _place(self, task) -> None:
+        deadline = as_utc(task.deadline) if task.deadline is not None else None
+        if (
+            deadline is None
+            or task.status == TaskStatus.DONE
+            or deadline <= self._fired_until
+            or deadline >= self._loaded_until
+        ):
+            self._tasks.pop(task.id, None)
+            return
+        self._tasks[task.id] = _entry(task)
+        heapq.heappush(self._heap, (deadline, task.id))
+        if self._heap[0][1] == task.id:
+            self._wake.set()
+
+    async def _load(self, now: datetime) -> None:
+        """Replace the heap with the open tasks due before ``now + window``.
+
+        Tasks rescheduled in this process while the query ran keep their
+        in-process state, which is at least as new as what was read.
+        """
+        previous_until = self._loaded_until
+        self._loaded_until = now + self.window
+        self._touched = set()
+        rows = []
+        try:
+            async with self.session_factory() as db:
+                position = None
+                while True:
+                    query = select(
+                        Task.id, Task.owner_id, Task.title, Task.deadline
+                    ).where(
+                        IS_OPEN,
+                        Task.deadline > self._fired_until,
+                        Task.deadline < self._loaded_until,
+                    )
+                    if position is not None:
+                        deadline, task_id = position
+                        query = query.where(
+                            or_(
+                                Task.deadline > deadline,
+                                and_(Task.deadline == deadline, Task.id > task_id),
+                            )
+                        )
+                    query = query.order_by(Task.deadline, Task.id).limit(
+                        self.batch_size
+                    )
+                    batch = (await db.execute(query)).all()
+                    rows += batch
+                    if len(batch) < self.batch_size:
+                        break
+                    position = (batch[-1].deadline, batch[-1].id)
+        except Exception:
+            self._loaded_until = previous_until
+            raise
+        tasks = {row.id: _entry(row) for row in rows if row.id not in self._touched}
+        for task_id in self._touched:
+            if task_id in self._tasks:
+                tasks[task_id] = self._tasks[task_id]
+        self._tasks = tasks
+        self._heap = [(task["deadline"], task_id) for task_id, task in tasks.items()]
+        heapq.heapify(self._heap)
+        self.loads += 1
+
+    async def _fire(self, now: datetime) -> None:
+        """Pop every task due by ``now`` and hand the batch to each hook."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, task_id = heapq.heappop(self._heap)
+            task = self._tasks.get(task_id)
+            if task is None or task["deadline"] != deadline:
+                continue
+            del self._tasks[task_id]
+            due.append(task)
+        self._fired_until = now
+        if not due:
+            return
+        self.fired += len(due)
+        for hook in self.hooks:
+            try:
+                await hook(due)
+                DEADLINE_REMINDERS.inc(hook.name, "delivered", amount=len(due))
+            except Exception:
+                self.failures += 1
+                DEADLINE_REMINDERS.inc(hook.name, "failed", amount=len(due))
+                logger.warning("Deadline hook %s failed", hook.name, exc_info=True)
+
+    async def _run(self) -> None:
+        next_refresh = utc_now()
+        while True:
+            now = utc_now()
+            if self._reload or now >= next_refresh:
+                self._reload = False
+                if await self._elect():
+                    try:
+                        await self._load(now)
+                    except Exception:
+                        logger.warning("Loading task deadlines failed", exc_info=True)
+                next_refresh = now + self.refresh
+            if self.leader:
+                await self._fire(utc_now())
+            wake_at = next_refresh
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            self._wake.clear()
+            delay = (wake_at - utc_now()).total_seconds()
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        """Report the loaded window and delivery counters."""
+        return {
+            "running": self.running,
+            "leader": self.leader,
+            "scheduled": len(self._tasks),
+            "heap": len(self._heap),
+            "fired_until": self._fired_until,
+            "loaded_until": self._loaded_until,
+            "loads": self.loads,
+            "fired": self.fired,
+            "hook_failures": self.failures,
+            "hooks": [hook.name for hook in self.hooks],
+        }
+
+
+deadline_scheduler = DeadlineScheduler(
+    hooks_from_env(),
+    DEADLINE_WINDOW_SECONDS,
+    DEADLINE_REFRESH_SECONDS,
+    DEADLINE_BATCH_SIZE,
+)
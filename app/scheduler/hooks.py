@@ -0,0 +1,97 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+from typing import List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated: "log", "webhook".
+DEADLINE_HOOKS = os.getenv("DEADLINE_HOOKS", "log")
+DEADLINE_WEBHOOK_URL = os.getenv("DEADLINE_WEBHOOK_URL")
+DEADLINE_WEBHOOK_SECRET = os.getenv("DEADLINE_WEBHOOK_SECRET")
+DEADLINE_WEBHOOK_TIMEOUT = float(os.getenv("DEADLINE_WEBHOOK_TIMEOUT", "5"))
+
+
+def _payload(task: dict) -> dict:
+    """JSON-ready view of a due task."""
+    return {**task, "deadline": task["deadline"].isoformat()}
+
+
+class LogHook:
+    """Writes one log line per due task."""
+
+    name = "log"
+
+    async def __call__(self, tasks: List[dict]) -> None:
+        for task in tasks:
+            logger.info(
+                "Task %s of user %s is due at %s",
+                task["id"],
+                task["owner_id"],
+                task["deadline"].isoformat(),
+            )
+
+    async def close(self) -> None:
+        pass
+
+
+class WebhookHook:
+    """POSTs each batch of due tasks as one JSON document.
+
+    With a secret, the body is signed with HMAC-SHA256 and the hex digest is
+    sent as ``X-Signature: sha256=<digest>``. Failed deliveries are not
+    retried; the scheduler counts and logs them.
+    """
+
+    name = "webhook"
+
+    def __init__(self, url: str, secret: Optional[str] = None, timeout: float = 5.0):
+        self.url = url
+        self.secret = secret
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __call__(self, tasks: List[dict]) -> None:
+        body = json.dumps(
+            {"event": "tasks.due", "tasks": [_payload(task) for task in tasks]},
+            separators=(",", ":"),
+        ).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            digest = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            headers["X-Signature"] = f"sha256={digest}"
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.post(self.url, content=body, headers=headers)
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def hooks_from_env() -> list:
+    """Build the hooks named in ``DEADLINE_HOOKS``."""
+    hooks = []
+    for name in filter(None, (part.strip() for part in DEADLINE_HOOKS.split(","))):
+        if name == "log":
+            hooks.append(LogHook())
+        elif name == "webhook" and DEADLINE_WEBHOOK_URL:
+            hooks.append(
+                WebhookHook(
+                    DEADLINE_WEBHOOK_URL,
+                    DEADLINE_WEBHOOK_SECRET,
+                    DEADLINE_WEBHOOK_TIMEOUT,
+                )
+            )
+        else:
+            logger.warning("Ignoring deadline hook %r", name)
+    return hooks
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 
@@ -40,3 +40,75 @@ class TaskResponse(TaskBase):
     updated_at: Optional[datetime]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+BULK_MAX_ITEMS = 1000
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """A partial update for one task in a bulk request."""
+
+    id: int
+
+
+class TaskBulkDelete(BaseModel):
+    """IDs of tasks to delete in a bulk request."""
+
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkItemResult(BaseModel):
+    """Outcome for one item of a bulk request, in request order."""
+
+    index: int
+    id: Optional[int]
+    status: Literal["created", "updated", "deleted", "not_found", "archived"]
+    task: Optional[TaskResponse] = None
+
+
+class TaskBulkResponse(BaseModel):
+    """Per-item results of a bulk request."""
+
+    results: List[TaskBulkItemResult]
+
+
+class TaskImportError(BaseModel):
+    """A rejected import row and the reason it was rejected."""
+
+    line: int
+    error: str
+
+
+class TaskImportSummary(BaseModel):
+    """Outcome of a streaming task import."""
+
+    accepted: int
+    rejected: int
+    errors: List[TaskImportError]
+
+
+class TaskStats(BaseModel):
+    """Aggregate counts over a user's tasks."""
+
+    total: int
+    by_status: Dict[TaskStatus, int]
+    by_priority: Dict[TaskPriority, int]
+    overdue: int = Field(..., description="Open tasks whose deadline has passed")
+    due_today: int = Field(..., description="Open tasks due before midnight UTC")
+
+
+class TaskChange(BaseModel):
+    """One entry of the change feed: a created/updated task or a deletion."""
+
+    op: Literal["upsert", "delete"]
+    id: int
+    changed_at: datetime
+    task: Optional[TaskResponse] = None
+
+
+class TaskChangeFeed(BaseModel):
+    """A page of changes and the cursor to resume from."""
+
+    changes: List[TaskChange]
+    next_cursor: Optional[str]
+    has_more: bool
@@ -61,9 +61,16 @@ class Token(BaseModel):
     """JWT token response model."""
 
     access_token: str
+    refresh_token: str
     token_type: str
 
 
+class RefreshRequest(BaseModel):
+    """Refresh token to exchange for a new token pair."""
+
+    refresh_token: str
+
+
 class UpdateEmailRequest(BaseModel):
     email: EmailStr
 
@@ -0,0 +1,77 @@
+"""Production entry point: ``python -m app.server``.
+
+Runs uvicorn with one worker per available CPU (``WEB_CONCURRENCY``
+overrides), uvloop and httptools when they are installed, and keep-alive and
+backlog settings suited to running behind a load balancer.
+"""
+
+import importlib.util
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Longer than typical load balancer idle timeouts (60s), so the balancer, not
+# uvicorn, closes idle connections and never reuses one that is being closed.
+KEEPALIVE_TIMEOUT = int(os.getenv("KEEPALIVE_TIMEOUT", "75"))
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+# Proxies whose X-Forwarded-For is trusted. Behind a load balancer this must
+# list it, or every client gets its address and one shared per-IP budget.
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+# Request metrics are exported at /metrics, so per-request log lines are opt-in.
+ACCESS_LOG = os.getenv("ACCESS_LOG", "false").lower() in {"1", "true", "yes", "on"}
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and cgroup CPU quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="ascii") as handle:
+            quota, period = handle.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(int(quota) // int(period), 1))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def worker_count() -> int:
+    """``WEB_CONCURRENCY`` if set, otherwise one async worker per CPU."""
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        return max(int(configured), 1)
+    return available_cpus()
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def server_options() -> dict:
+    """Keyword arguments for :func:`uvicorn.run`."""
+    return {
+        "host": HOST,
+        "port": PORT,
+        "workers": worker_count(),
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "timeout_keep_alive": KEEPALIVE_TIMEOUT,
+        "backlog": BACKLOG,
+        "timeout_graceful_shutdown": GRACEFUL_SHUTDOWN_TIMEOUT,
+        "proxy_headers": True,
+        "forwarded_allow_ips": FORWARDED_ALLOW_IPS,
+        "access_log": ACCESS_LOG,
+        "lifespan": "on",
+    }
+
+
+if __name__ == "__main__":
+    uvicorn.run("app.main:app", **server_options())
@@ -0,0 +1,49 @@
+"""Compare two load-test reports scenario by scenario.
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import json
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main(before_path: str, after_path: str) -> None:
+    before, after = _load(before_path), _load(after_path)
+    print(
+        f"before: {before['environment'].get('commit')}  "
+        f"after: {after['environment'].get('commit')}"
+    )
+    print(f"{'scenario':<16} {'metric':<14} {'before':>12} {'after':>12} {'change':>9}")
+    for name, new in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if old is None:
+            continue
+        rows = [("ops/s", old["throughput_per_second"], new["throughput_per_second"])]
+        rows += [
+            (f"{key} ms", old["latency_ms"][key], new["latency_ms"][key])
+            for key in ("p50", "p95", "p99")
+        ]
+        for metric, old_value, new_value in rows:
+            print(
+                f"{name:<16} {metric:<14} {old_value:>12,.2f} {new_value:>12,.2f} "
+                f"{_change(old_value, new_value):>9}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+    main(args.before, args.after)
@@ -0,0 +1,219 @@
+"""Drive the API with concurrent scenarios and report latency percentiles.
+
+Runs against ``app.main:app`` in-process over ASGI by default, or against a
+running server with ``--target``. Seed data first with ``benchmarks.seed``:
+
+    python -m benchmarks.load --scenarios list paginate mixed --concurrency 20
+    python -m benchmarks.load --target http://127.0.0.1:8000 --output after.json
+
+Scenarios: login, list, paginate, search, crud and mixed.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.report import environment, summarize, write_report
+from benchmarks.seed import BENCH_PASSWORD, WORDS, bench_email
+
+MIXED_WEIGHTS = {"list": 45, "paginate": 15, "search": 20, "crud": 18, "login": 2}
+
+
+class RequestFailed(Exception):
+    """A scenario request returned an error status."""
+
+
+def _check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RequestFailed(f"{response.request.url.path}: {response.status_code}")
+    return response
+
+
+async def login(client: httpx.AsyncClient, email: str) -> Dict[str, str]:
+    """Log a benchmark user in and return its authorization header."""
+    response = _check(
+        await client.post(
+            "/auth/token", data={"username": email, "password": BENCH_PASSWORD}
+        )
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class Worker:
+    """One simulated client: a user, its token and its pagination position."""
+
+    def __init__(self, client: httpx.AsyncClient, email: str, headers, seed: int):
+        self.client = client
+        self.email = email
+        self.headers = headers
+        self.rng = random.Random(seed)
+        self.cursor: Optional[str] = None
+
+    async def login(self) -> None:
+        await login(self.client, self.email)
+
+    async def list(self) -> None:
+        params = {"limit": 50}
+        choice = self.rng.randrange(4)
+        if choice == 0:
+            params["status"] = self.rng.choice(["to-do", "in_progress", "done"])
+        elif choice == 1:
+            params["priority"] = self.rng.choice(["low", "medium", "high"])
+        elif choice == 2:
+            params.update(order_by="deadline", order_dir="desc")
+        else:
+            params["show_completed"] = "false"
+        _check(await self.client.get("/tasks/", params=params, headers=self.headers))
+
+    async def paginate(self) -> None:
+        params = {"limit": 100}
+        if self.cursor:
+            params["cursor"] = self.cursor
+        response = _check(
+            await self.client.get("/tasks/", params=params, headers=self.headers)
+        )
+        self.cursor = response.headers.get("X-Next-Cursor")
+
+    async def search(self) -> None:
+        params = {"q": self.rng.choice(WORDS), "limit": 20}
+        _check(
+            await self.client.get("/tasks/search", params=params, headers=self.headers)
+        )
+
+    async def crud(self) -> None:
+        created = _check(
+            await self.client.post(
+                "/tasks/",
+                json={"title": "Load test task", "priority": "low"},
+                headers=self.headers,
+            )
+        )
+        task_id = created.json()["id"]
+        _check(
+            await self.client.put(
+                f"/tasks/{task_id}",
+                json={"status": "in_progress"},
+                headers=self.headers,
+            )
+        )
+        _check(await self.client.delete(f"/tasks/{task_id}", headers=self.headers))
+
+    async def mixed(self) -> None:
+        name = self.rng.choices(
+            list(MIXED_WEIGHTS), weights=list(MIXED_WEIGHTS.values())
+        )[0]
+        await getattr(self, name)()
+
+
+SCENARIOS = ["login", "list", "paginate", "search", "crud", "mixed"]
+
+
+async def run_scenario(workers: List[Worker], name: str, duration: float) -> dict:
+    """Run ``name`` on every worker until ``duration`` seconds have passed."""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def loop(worker: Worker) -> None:
+        nonlocal errors
+        operation = getattr(worker, name)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await operation()
+            except (RequestFailed, httpx.HTTPError):
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(loop(worker) for worker in workers))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def drive(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    tokens = {}
+    for index in range(args.users):
+        email = bench_email(index)
+        tokens[email] = await login(client, email)
+    workers = [
+        Worker(client, email, tokens[email], seed=args.seed + number)
+        for number, email in (
+            (number, bench_email(number % args.users))
+            for number in range(args.concurrency)
+        )
+    ]
+    scenarios = {}
+    for name in args.scenarios:
+        if args.warmup:
+            await run_scenario(workers, name, args.warmup)
+        scenarios[name] = await run_scenario(workers, name, args.duration)
+        summary = scenarios[name]
+        print(
+            f"{name:<10} {summary['throughput_per_second']:>10,.1f} ops/s  "
+            f"p50 {summary['latency_ms']['p50']:>8.2f} ms  "
+            f"p95 {summary['latency_ms']['p95']:>8.2f} ms  "
+            f"p99 {summary['latency_ms']['p99']:>8.2f} ms  "
+            f"errors {summary['errors']}"
+        )
+    return scenarios
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.target:
+        async with httpx.AsyncClient(
+            base_url=args.target, limits=limits, timeout=60
+        ) as client:
+            scenarios = await drive(client, args)
+    else:
+        # Every simulated client shares one address and a few users, so the
+        # per-client budgets would throttle the benchmark itself.
+        os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=60
+            ) as client:
+                scenarios = await drive(client, args)
+    report = {
+        "environment": environment(),
+        "settings": {
+            "target": args.target or "asgi",
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "users": args.users,
+        },
+        "scenarios": scenarios,
+    }
+    write_report(report, args.output)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--target", help="Base URL of a running server")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds")
+    parser.add_argument("--users", type=int, default=10, help="Seeded users to use")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON report path (default: stdout)")
+    parser.add_argument("--database-url", help="Overrides DATABASE_URL_LOCAL")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.database_url:
+        os.environ["ENV"] = "local"
+        os.environ["DATABASE_URL_LOCAL"] = arguments.database_url
+    asyncio.run(main(arguments))
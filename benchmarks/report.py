@@ -0,0 +1,71 @@
+"""Summaries and JSON reports shared by the benchmark tools."""
+
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import List, Optional
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    """Throughput and latency percentiles (in milliseconds) for one scenario."""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "operations": count,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_per_second": round(count / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / count * 1000, 3) if count else 0.0,
+            "p50": round(percentile(values, 0.50) * 1000, 3),
+            "p95": round(percentile(values, 0.95) * 1000, 3),
+            "p99": round(percentile(values, 0.99) * 1000, 3),
+            "max": round(values[-1] * 1000, 3) if count else 0.0,
+        },
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def environment() -> dict:
+    """Describe where a run happened, so reports can be compared fairly."""
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_report(report: dict, path: Optional[str]) -> None:
+    """Write a report as JSON to ``path``, or to stdout when it is None."""
+    text = json.dumps(report, indent=2)
+    if path is None:
+        print(text)
+        return
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(text + "\n")
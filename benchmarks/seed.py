@@ -0,0 +1,179 @@
+"""Bulk-generate benchmark users and tasks with realistic distributions.
+
+Creates ``--users`` accounts (bench0@example.com, bench1@example.com, ...)
+sharing one password, each owning ``--tasks`` tasks, in the database the app
+is configured for or the one given with ``--database-url``:
+
+    python -m benchmarks.seed --users 100 --tasks 1000 \\
+        --database-url sqlite+aiosqlite:///bench.db --create-schema
+
+Output is deterministic for a given ``--seed``.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import timedelta
+from typing import List
+
+BENCH_PASSWORD = "Bench-pass1!"
+BENCH_EMAIL = "bench{}@example.com"
+
+STATUS_WEIGHTS = {"TODO": 50, "IN_PROGRESS": 20, "DONE": 30}
+PRIORITY_WEIGHTS = {"NONE": 30, "LOW": 25, "MEDIUM": 25, "HIGH": 15, "CRITICAL": 5}
+NO_DEADLINE_SHARE = 0.25
+WORDS = (
+    "review report invoice meeting draft release deploy call budget design "
+    "client backlog refactor migrate schema docs onboarding audit roadmap "
+    "security hiring training planning sync follow-up fix test cleanup"
+).split()
+
+
+def bench_email(index: int) -> str:
+    """Email address of the ``index``-th benchmark user."""
+    return BENCH_EMAIL.format(index)
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def generate_tasks(rng: random.Random, owner_id: int, count: int, now) -> List[dict]:
+    """Build ``count`` task rows for one user.
+
+    Tasks were created over the last 180 days and touched some time after.
+    Open tasks have deadlines spread around today, so some are overdue;
+    done tasks mostly have deadlines in the past.
+    """
+    from app.models.enums import TaskPriority, TaskStatus
+
+    statuses = rng.choices(
+        [TaskStatus[name] for name in STATUS_WEIGHTS],
+        weights=list(STATUS_WEIGHTS.values()),
+        k=count,
+    )
+    priorities = rng.choices(
+        [TaskPriority[name] for name in PRIORITY_WEIGHTS],
+        weights=list(PRIORITY_WEIGHTS.values()),
+        k=count,
+    )
+    rows = []
+    for status, priority in zip(statuses, priorities):
+        created_at = now - timedelta(seconds=rng.uniform(0, 180 * 86400))
+        updated_at = created_at + (now - created_at) * rng.random() ** 2
+        deadline = None
+        if rng.random() >= NO_DEADLINE_SHARE:
+            center = -10 if status == TaskStatus.DONE else 5
+            deadline = now + timedelta(days=rng.gauss(center, 15))
+        rows.append(
+            {
+                "title": _sentence(rng, 2, 6).capitalize(),
+                "description": _sentence(rng, 0, 25) or None,
+                "deadline": deadline,
+                "status": status,
+                "priority": priority,
+                "owner_id": owner_id,
+                "created_at": created_at,
+                "updated_at": updated_at,
+            }
+        )
+    return rows
+
+
+async def create_schema() -> None:
+    """Create tables, search indexes and counter triggers on a fresh database."""
+    from app.db.database import Base, async_engine
+    from app.db.fulltext import install_search
+    from app.db.task_counters import install_counters
+    from app.models import models  # noqa: F401
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.run_sync(install_search)
+        await connection.run_sync(install_counters)
+
+
+async def seed(users: int, tasks: int, seed_value: int, batch_size: int) -> dict:
+    """Insert the benchmark users and their tasks; return what was written."""
+    from sqlalchemy import insert, select
+
+    from app.auth.hash import get_password_hash
+    from app.db.database import async_session
+    from app.models.models import Task, User, utc_now
+
+    rng = random.Random(seed_value)
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    now = utc_now()
+    emails = [bench_email(index) for index in range(users)]
+    start = time.perf_counter()
+
+    async with async_session() as session:
+        result = await session.execute(select(User.email).where(User.email.in_(emails)))
+        existing = set(result.scalars())
+        new_users = [
+            {"email": email, "hashed_password": hashed_password, "created_at": now}
+            for email in emails
+            if email not in existing
+        ]
+        if new_users:
+            await session.execute(insert(User), new_users)
+        result = await session.execute(
+            select(User.id).where(User.email.in_(emails)).order_by(User.id)
+        )
+        user_ids = list(result.scalars())
+
+        batch: List[dict] = []
+        for user_id in user_ids:
+            batch.extend(generate_tasks(rng, user_id, tasks, now))
+            if len(batch) >= batch_size:
+                await session.execute(insert(Task), batch)
+                batch = []
+        if batch:
+            await session.execute(insert(Task), batch)
+        await session.commit()
+
+    return {
+        "users": len(user_ids),
+        "new_users": len(new_users),
+        "tasks": len(user_ids) * tasks,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.db.database import async_engine
+
+    if args.create_schema:
+        await create_schema()
+    summary = await seed(args.users, args.tasks, args.seed, args.batch_size)
+    print(
+        f"Seeded {summary['tasks']:,} tasks for {summary['users']} users "
+        f"({summary['new_users']} new) in {summary['seconds']}s; "
+        f"password: {BENCH_PASSWORD}"
+    )
+    await async_engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--database-url", help="Overrides DATABASE_URL_LOCAL")
+    parser.add_argument(
+        "--create-schema",
+        action="store_true",
+        help="Create tables directly instead of running migrations",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.database_url:
+        os.environ["ENV"] = "local"
+        os.environ["DATABASE_URL_LOCAL"] = arguments.database_url
+    asyncio.run(main(arguments))
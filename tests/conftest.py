@@ -0,0 +1,88 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+_DATA_DIR = tempfile.mkdtemp(prefix="task-manager-tests-")
+
+# Configure the app before it is imported: a throwaway SQLite database, no
+# per-process caches that would hide queries, and budgets that fail requests.
+os.environ.update(
+    {
+        "ENV": "local",
+        "DATABASE_URL_LOCAL": f"sqlite+aiosqlite:///{_DATA_DIR}/test.db",
+        "SECRET_KEY": "test-secret",
+        "QUERY_BUDGET_MODE": "raise",
+        "PRINCIPAL_CACHE_SIZE": "0",
+        "TASK_CACHE_BACKEND": "none",
+        "RATE_LIMIT_BACKEND": "none",
+        "ADMISSION_BACKEND": "none",
+        "DATABASE_REPLICA_URLS": "",
+        "DEADLINE_SCHEDULER": "false",
+        "TASK_ARCHIVE_INTERVAL_SECONDS": "0",
+        "WARMUP": "false",
+        "BCRYPT_ROUNDS": "4",
+    }
+)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.db.database import Base, async_engine  # noqa: E402
+from app.db.fulltext import install_search  # noqa: E402
+from app.db.task_counters import install_counters  # noqa: E402
+from app.main import app  # noqa: E402
+from app.metrics.query_budget import count_queries  # noqa: E402
+
+PASSWORD = "Passw0rd!x"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    """Client for the app on a freshly created schema."""
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.run_sync(install_search)
+        await connection.run_sync(install_counters)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+    finally:
+        await async_engine.dispose()
+
+
+@pytest.fixture
+async def auth_headers(client):
+    """Bearer headers of a newly registered user."""
+    email = "user@example.com"
+    response = await client.post(
+        "/auth/register", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 201, response.text
+    response = await client.post(
+        "/auth/token", data={"username": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def assert_queries():
+    """Context manager asserting the exact number of SQL statements in a block."""
+
+    @contextmanager
+    def check(expected: int):
+        with count_queries() as queries:
+            yield queries
+        assert queries.statements == expected, (
+            f"expected {expected} SQL statements, got {queries.statements}: "
+            f"{queries.statement_counts}"
+        )
+
+    return check
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+import pytest
+
+from app.db.archive import archive_batch
+from app.db.database import async_engine
+from app.models.models import utc_now
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_update_reports_archived_tasks(client, auth_headers):
+    ids = []
+    for status in ("done", "to-do"):
+        response = await client.post(
+            "/tasks/", headers=auth_headers, json={"title": "Task", "status": status}
+        )
+        ids.append(response.json()["id"])
+    async with async_engine.begin() as connection:
+        await archive_batch(connection, utc_now() + timedelta(days=1), 100)
+    archived_id, active_id = ids
+
+    response = await client.put(
+        f"/tasks/{archived_id}", headers=auth_headers, json={"title": "Renamed"}
+    )
+    assert response.status_code == 409
+
+    response = await client.patch(
+        "/tasks/bulk",
+        headers=auth_headers,
+        json=[
+            {"id": archived_id, "title": "Renamed"},
+            {"id": active_id, "title": "Renamed"},
+            {"id": 999, "title": "Renamed"},
+        ],
+    )
+    assert response.status_code == 200
+    statuses = [item["status"] for item in response.json()["results"]]
+    assert statuses == ["archived", "updated", "not_found"]
+
+
+async def test_archived_task_ids_are_not_reused(client, auth_headers):
+    response = await client.post(
+        "/tasks/", headers=auth_headers, json={"title": "Task", "status": "done"}
+    )
+    archived_id = response.json()["id"]
+    async with async_engine.begin() as connection:
+        await archive_batch(connection, utc_now() + timedelta(days=1), 100)
+
+    response = await client.post(
+        "/tasks/", headers=auth_headers, json={"title": "Task"}
+    )
+    assert response.json()["id"] > archived_id
@@ -0,0 +1,44 @@
+import anyio
+import pytest
+
+from app.cache.backends import RedisCacheBackend
+from app.cache.task_cache import TaskListCache
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def redis_backend():
+    return RedisCacheBackend(fakeredis.FakeAsyncRedis(), ttl=0.2)
+
+
+async def test_redis_backend_round_trip_and_ttl(redis_backend):
+    assert await redis_backend.get("page") is None
+    await redis_backend.set("page", b"body")
+    assert await redis_backend.get("page") == b"body"
+    assert 0 < await redis_backend.client.pttl("taskcache:page") <= 200
+
+    await anyio.sleep(0.3)
+    assert await redis_backend.get("page") is None
+
+
+async def test_redis_backend_clear_removes_only_its_keys(redis_backend):
+    await redis_backend.set("page", b"body")
+    await redis_backend.client.set("other", b"kept")
+    await redis_backend.clear()
+    assert await redis_backend.get("page") is None
+    assert await redis_backend.client.get("other") == b"kept"
+
+
+async def test_task_list_keys_follow_the_collection_version(redis_backend):
+    cache = TaskListCache(redis_backend)
+    filters = {"limit": 10, "cursor": None}
+    key = cache.key(1, filters, (1, "2026-01-01T00:00:00"))
+    await cache.set(key, b"[]", "next")
+    assert await cache.get(key) == (b"[]", "next")
+    assert cache.key(1, filters, (1, "2026-01-01T00:00:00")) == key
+
+    assert cache.key(1, filters, (2, "2026-01-01T00:00:01")) != key
+    assert cache.key(2, filters, (1, "2026-01-01T00:00:00")) != key
@@ -0,0 +1,48 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_tasks(client, headers, count: int) -> None:
+    for index in range(count):
+        response = await client.post(
+            "/tasks/",
+            headers=headers,
+            json={"title": f"Task {index}", "description": "same words " * 5},
+        )
+        assert response.status_code == 200
+
+
+async def test_large_list_is_compressed(client, auth_headers):
+    await _create_tasks(client, auth_headers, 20)
+    headers = {**auth_headers, "Accept-Encoding": "gzip"}
+    response = await client.get("/tasks/", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"].startswith('W/"')
+    assert int(response.headers["content-length"]) < len(response.content)
+
+
+async def test_small_response_is_marked_but_not_compressed(client, auth_headers):
+    await _create_tasks(client, auth_headers, 1)
+    headers = {**auth_headers, "Accept-Encoding": "gzip"}
+    response = await client.get("/tasks/", headers=headers)
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    response = await client.get("/tasks/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == etag
+
+
+async def test_identity_response_is_untouched(client, auth_headers):
+    await _create_tasks(client, auth_headers, 20)
+    headers = {**auth_headers, "Accept-Encoding": "identity"}
+    response = await client.get("/tasks/", headers=headers)
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+    assert not response.headers["etag"].startswith("W/")
+    assert len(response.json()) == 20
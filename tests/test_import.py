@@ -0,0 +1,35 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_csv_import_accepts_bare_quotes_and_quoted_newlines(
+    client, auth_headers
+):
+    body = (
+        "title,description\n"
+        'Monitor,27" screen\n'
+        '"Two\nlines",ok\n'
+        'Third,"say ""hi"""\n'
+    )
+    response = await client.post(
+        "/tasks/import?format=csv", headers=auth_headers, content=body.encode()
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"accepted": 3, "rejected": 0, "errors": []}
+
+    response = await client.get("/tasks/?order_by=created_at", headers=auth_headers)
+    descriptions = sorted(task["description"] for task in response.json())
+    assert descriptions == ['27" screen', "ok", 'say "hi"']
+
+
+async def test_csv_import_reports_unterminated_field(client, auth_headers):
+    body = 'title,description\nFirst,ok\nSecond,"never closed\nmore\n'
+    response = await client.post(
+        "/tasks/import?format=csv", headers=auth_headers, content=body.encode()
+    )
+    assert response.json() == {
+        "accepted": 1,
+        "rejected": 1,
+        "errors": [{"line": 3, "error": "Unterminated quoted field"}],
+    }
@@ -0,0 +1,133 @@
+"""Regression tests for the SQL statement counts declared with ``@query_budget``.
+
+Counts include authentication; the principal cache is disabled so every
+request loads its user.
+"""
+
+from datetime import timedelta
+
+import pytest
+
+from app.db.archive import archive_batch
+from app.db.database import async_engine
+from app.models.models import utc_now
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_task(client, headers, **fields) -> dict:
+    payload = {"title": "Write report", "description": "quarterly numbers"}
+    response = await client.post("/tasks/", headers=headers, json={**payload, **fields})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def _archive_done_tasks() -> None:
+    async with async_engine.begin() as connection:
+        await archive_batch(connection, utc_now() + timedelta(days=1), 100)
+
+
+async def test_create_task(client, auth_headers, assert_queries):
+    with assert_queries(3):
+        response = await client.post(
+            "/tasks/", headers=auth_headers, json={"title": "Write report"}
+        )
+    assert response.status_code == 200
+
+
+async def test_list_tasks(client, auth_headers, assert_queries):
+    for _ in range(3):
+        await _create_task(client, auth_headers)
+    with assert_queries(3):
+        response = await client.get("/tasks/", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+
+async def test_list_tasks_not_modified(client, auth_headers, assert_queries):
+    await _create_task(client, auth_headers)
+    response = await client.get("/tasks/", headers=auth_headers)
+    headers = {**auth_headers, "If-None-Match": response.headers["etag"]}
+    with assert_queries(2):
+        response = await client.get("/tasks/", headers=headers)
+    assert response.status_code == 304
+
+
+async def test_task_changes(client, auth_headers, assert_queries):
+    await _create_task(client, auth_headers)
+    with assert_queries(3):
+        response = await client.get("/tasks/changes", headers=auth_headers)
+    assert response.status_code == 200
+
+
+async def test_task_stats(client, auth_headers, assert_queries):
+    await _create_task(client, auth_headers)
+    with assert_queries(3):
+        response = await client.get("/tasks/stats", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+
+async def test_due_tasks(client, auth_headers, assert_queries):
+    deadline = (utc_now() + timedelta(hours=1)).isoformat()
+    await _create_task(client, auth_headers, deadline=deadline)
+    with assert_queries(2):
+        response = await client.get("/tasks/due?within=2h", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+async def test_search_tasks(client, auth_headers, assert_queries):
+    await _create_task(client, auth_headers)
+    with assert_queries(2):
+        response = await client.get("/tasks/search?q=report", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+async def test_get_task(client, auth_headers, assert_queries):
+    task = await _create_task(client, auth_headers)
+    with assert_queries(2):
+        response = await client.get(f"/tasks/{task['id']}", headers=auth_headers)
+    assert response.status_code == 200
+
+
+async def test_update_task(client, auth_headers, assert_queries):
+    task = await _create_task(client, auth_headers)
+    with assert_queries(2):
+        response = await client.put(
+            f"/tasks/{task['id']}", headers=auth_headers, json={"title": "Renamed"}
+        )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+
+
+async def test_delete_task(client, auth_headers, assert_queries):
+    task = await _create_task(client, auth_headers)
+    with assert_queries(3):
+        response = await client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+    assert response.status_code == 204
+
+
+async def test_delete_archived_task(client, auth_headers, assert_queries):
+    task = await _create_task(client, auth_headers, status="done")
+    await _archive_done_tasks()
+    with assert_queries(4):
+        response = await client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+    assert response.status_code == 204
+
+
+async def test_restore_task(client, auth_headers, assert_queries):
+    task = await _create_task(client, auth_headers, status="done")
+    await _archive_done_tasks()
+    with assert_queries(4):
+        response = await client.post(
+            f"/tasks/{task['id']}/restore", headers=auth_headers
+        )
+    assert response.status_code == 200
+
+
+async def test_read_current_user(client, auth_headers, assert_queries):
+    with assert_queries(1):
+        response = await client.get("/users/me", headers=auth_headers)
+    assert response.status_code == 200